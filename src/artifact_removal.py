@@ -0,0 +1,144 @@
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 🔧 Parameters
+ICA_CACHE_DIR = Path("data/ica")
+N_COMPONENTS = 20           # ICA components per subject
+ICA_DECIM = 4               # Fit on every 4th sample (40 Hz at 160 Hz; ICA only needs the spatial mixing)
+ICA_HIGHPASS = 1.           # ICA is unstable with slow drifts; the fit copy is high-passed to at least this
+RANDOM_STATE = 42
+ICA_MAX_ITER = 2000         # FastICA iterations ("auto" = 1000 stops short on some real runs)
+ICA_TOL = 1e-3              # FastICA convergence tolerance (sklearn default 1e-4)
+EOG_PROXY_CHANNELS = ["Fp1.", "Fp2."]   # No EOG channels in the dataset: frontal electrodes pick up blinks
+MUSCLE_THRESHOLD = 0.5
+MUSCLE_FMAX = 45.           # Top of the muscle band, lowered to below Nyquist for decimated data
+MAX_MUSCLE_COMPONENTS = 3   # Never remove more than this many components as muscle
+N_JOBS = 4                  # Runs cleaned in parallel
+
+
+def ica_params() -> dict:
+    """
+    Everything that changes the decomposition; part of the cache key.
+    """
+    return {
+        "n_components": N_COMPONENTS,
+        "decim": ICA_DECIM,
+        "highpass": ICA_HIGHPASS,
+        "random_state": RANDOM_STATE,
+        "max_iter": ICA_MAX_ITER,
+        "tol": ICA_TOL,
+        "eog_channels": EOG_PROXY_CHANNELS,
+        "muscle_threshold": MUSCLE_THRESHOLD,
+        "muscle_fmax": MUSCLE_FMAX,
+        "max_muscle": MAX_MUSCLE_COMPONENTS,
+    }
+
+
+def cache_key(subject: str, raws: list, run_names: list, extra: dict = None) -> str:
+    """
+    Hash of the subject, its runs, the data they contain (shape, sfreq, filters) and the ICA parameters.
+
+    :param subject: Subject ID, e.g. "S001"
+    :param raws: Cleaned runs of the subject
+    :param run_names: Names of the runs (e.g. source file names), in the same order
+    :param extra: Additional settings that change the input data (e.g. preprocessing parameters)
+    """
+    description = {
+        "subject": subject,
+        "runs": [
+            [name, int(raw.n_times), float(raw.info["sfreq"]), float(raw.info["highpass"]),
+             float(raw.info["lowpass"])]
+            for name, raw in sorted(zip(run_names, raws), key=lambda pair: pair[0])
+        ],
+        "ica": ica_params(),
+        "extra": extra or {},
+    }
+    return hashlib.sha1(json.dumps(description, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def fit_subject_ica(raws: list):
+    """
+    Fit one ICA on all runs of a subject, using a decimated, high-passed copy.
+
+    :param raws: Cleaned runs of one subject (same channels)
+    :return: Fitted mne.preprocessing.ICA with ica.exclude set to the artifact components
+    """
+    import mne
+    import numpy as np
+
+    fit_raw = mne.concatenate_raws([raw.copy() for raw in raws], verbose=False)
+    if fit_raw.info["highpass"] < ICA_HIGHPASS:
+        fit_raw.filter(l_freq=ICA_HIGHPASS, h_freq=None, verbose=False)
+
+    ica = mne.preprocessing.ICA(n_components=N_COMPONENTS, random_state=RANDOM_STATE, max_iter=ICA_MAX_ITER,
+                                fit_params={"tol": ICA_TOL})
+    ica.fit(fit_raw, decim=ICA_DECIM, verbose=False)
+
+    # === Find artifact components ===
+    eog_channels = [ch for ch in EOG_PROXY_CHANNELS if ch in fit_raw.ch_names]
+    eog_idx = ica.find_bads_eog(fit_raw, ch_name=eog_channels, verbose=False)[0] if eog_channels else []
+
+    # The muscle band (7–45 Hz) must stay below Nyquist, e.g. 40 Hz after preprocessing with decim=2
+    h_freq = min(MUSCLE_FMAX, fit_raw.info["sfreq"] / 2. - 1.)
+    muscle_idx, muscle_scores = ica.find_bads_muscle(fit_raw, threshold=MUSCLE_THRESHOLD, h_freq=h_freq,
+                                                     verbose=False)
+    muscle_idx = sorted(muscle_idx, key=lambda i: muscle_scores[i], reverse=True)[:MAX_MUSCLE_COMPONENTS]
+
+    ica.exclude = sorted({int(i) for i in np.concatenate([eog_idx, muscle_idx]).astype(int)})
+    return ica
+
+
+def load_or_fit_ica(subject: str, raws: list, run_names: list, cache_dir: Path = ICA_CACHE_DIR,
+                    extra: dict = None) -> tuple:
+    """
+    Load the subject's ICA from the cache, or fit and cache it.
+
+    :return: (ica, cached) where cached tells whether the decomposition was reused
+    """
+    import mne
+
+    key = cache_key(subject, raws, run_names, extra)
+    cache_path = cache_dir / f"{subject}_{key}-ica.fif"
+    if cache_path.exists():
+        return mne.preprocessing.read_ica(cache_path, verbose=False), True
+
+    ica = fit_subject_ica(raws)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    ica.save(cache_path, overwrite=True, verbose=False)  # Unmixing matrices + excluded components
+    return ica, False
+
+
+def apply_ica(ica, raws: list, n_jobs: int = N_JOBS) -> list:
+    """
+    Remove the excluded components from every run in place, in parallel threads
+    (the work is a matrix product, which releases the GIL).
+    """
+    with ThreadPoolExecutor(n_jobs) as pool:
+        return list(pool.map(lambda raw: ica.apply(raw, verbose=False), raws))
+
+
+def remove_artifacts(subject: str, raws: list, run_names: list, cache_dir: Path = ICA_CACHE_DIR,
+                     extra: dict = None) -> dict:
+    """
+    ICA artifact removal for all runs of one subject: one (cached) decomposition, applied to every run.
+
+    :param subject: Subject ID, e.g. "S001"
+    :param raws: Cleaned runs of the subject, modified in place
+    :param run_names: Names of the runs, in the same order (used for the cache key)
+    :param cache_dir: Folder with cached decompositions
+    :param extra: Additional settings that change the input data (part of the cache key)
+    :return: Report with the excluded components, whether the cache was used and the timings
+    """
+    start = time.perf_counter()
+    ica, cached = load_or_fit_ica(subject, raws, run_names, cache_dir, extra)
+    fit_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    apply_ica(ica, raws)
+    apply_s = time.perf_counter() - start
+
+    return {"subject": subject, "excluded": [int(i) for i in ica.exclude], "cached": cached,
+            "fit_s": fit_s, "apply_s": apply_s}
@@ -0,0 +1,120 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Make src/ importable when run as: python src/benchmarks/bench_decimation.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import preprocessing  # noqa: E402
+
+# 🔧 Parameters
+DECIM = 2
+N_FILES = 10          # Number of raw recordings to benchmark
+N_REPEATS = 3         # Timings are the best of N_REPEATS runs
+
+
+def best_time(func, *args, **kwargs) -> float:
+    """
+    Best wall-clock time (seconds) of func(*args, **kwargs) over N_REPEATS runs.
+    """
+    times = []
+    for _ in range(N_REPEATS):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def entropy_features(raw):
+    """
+    The sample-based features of features_entropy.py and the per-channel complexity bank,
+    computed as the scripts do: on the common FEATURE_SFREQ copy of the signal.
+    """
+    import numpy as np
+    from antropy import sample_entropy
+    from features.features_complexity import complexity_bank
+
+    data = preprocessing.to_feature_rate(raw.get_data(), raw.info["sfreq"])
+    sample_entropy(np.mean(data, axis=0))
+    complexity_bank(data, preprocessing.FEATURE_SFREQ)
+
+
+def feature_row(fif_file: Path) -> dict:
+    """
+    All features exactly as the feature scripts compute them. Per-channel complexity
+    features are kept per channel and summarized per feature in benchmark_file.
+    """
+    from features import features_advanced, features_complexity, features_entropy
+
+    row = {**features_advanced.extract_features(fif_file), **features_entropy.extract_features(fif_file)}
+    complexity = features_complexity.extract_features(fif_file)
+    row.update({f"complexity:{name}": value for name, value in complexity.items()
+                if name not in ("subject", "run", "label")})
+    return {name: value for name, value in row.items() if name not in ("subject", "run", "label")}
+
+
+def benchmark_file(edf_path: Path, full_dir: Path, decim_dir: Path) -> dict:
+    """
+    Clean one recording at full and reduced rate and compare cost and features of both paths.
+    """
+    import mne
+    import numpy as np
+
+    row = {"file": edf_path.name}
+    row["clean_s_full"] = best_time(preprocessing.preprocess_file, edf_path, full_dir, 1)
+    row["clean_s_decim"] = best_time(preprocessing.preprocess_file, edf_path, decim_dir, DECIM)
+
+    fif_name = edf_path.with_suffix(".fif").name
+    for key, folder in [("full", full_dir), ("decim", decim_dir)]:
+        fif_file = folder / fif_name
+        row[f"size_mb_{key}"] = fif_file.stat().st_size / 1e6
+        raw = mne.io.read_raw_fif(fif_file, preload=True, verbose=False)
+        row[f"psd_s_{key}"] = best_time(raw.compute_psd, fmin=1, fmax=30, verbose=False)
+        row[f"entropy_s_{key}"] = best_time(entropy_features, raw)
+
+    # Spectral features use Welch windows fixed in seconds; sample-based ones are computed on a
+    # common FEATURE_SFREQ signal. Per-channel complexity features: median over channels.
+    full = feature_row(full_dir / fif_name)
+    reduced = feature_row(decim_dir / fif_name)
+    per_channel = {}
+    for name in full:
+        rel_diff = abs(reduced[name] - full[name]) / abs(full[name])
+        if name.startswith("complexity:"):
+            per_channel.setdefault(name.rsplit("_", 1)[0], []).append(rel_diff)
+        else:
+            row[f"rel_diff_{name}"] = rel_diff
+    for name, diffs in per_channel.items():
+        row[f"rel_diff_{name}"] = float(np.median(diffs))
+    return row
+
+
+def main():
+    import mne
+    import pandas as pd
+    mne.set_log_level("ERROR")
+    edf_files = sorted(preprocessing.RAW_DATA_DIR.glob("*.edf"))[:N_FILES]
+    print(f"⏱️ Benchmarking decimation by {DECIM} on {len(edf_files)} recording(s)...\n")
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        full_dir, decim_dir = Path(tmp) / "full", Path(tmp) / "decim"
+        for edf_path in edf_files:
+            print(f"🔹 {edf_path.name}")
+            rows.append(benchmark_file(edf_path, full_dir, decim_dir))
+
+    df = pd.DataFrame(rows)
+    totals = df.sum(numeric_only=True)
+
+    print("\n=== Totals (full rate → decimated) ===")
+    for metric, unit in [("clean_s", "s"), ("size_mb", "MB"), ("psd_s", "s"), ("entropy_s", "s")]:
+        full, reduced = totals[f"{metric}_full"], totals[f"{metric}_decim"]
+        print(f"{metric:>10}: {full:8.3f} {unit} → {reduced:8.3f} {unit}  ({full / reduced:.2f}× less)")
+
+    print("\n=== Feature agreement (relative difference, decimated vs full rate) ===")
+    for column in [c for c in df.columns if c.startswith("rel_diff_")]:
+        print(f"{column[len('rel_diff_'):]:>28}  median {df[column].median():.1e}  max {df[column].max():.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Make src/ importable when run as: python src/benchmarks/bench_ica.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import artifact_removal  # noqa: E402
+import preprocessing  # noqa: E402
+
+# 🔧 Parameters
+N_SUBJECTS = 3
+
+
+def per_run_ica(raws: list):
+    """
+    Baseline: a separate full-rate ICA for every run, with the same artifact detection.
+    """
+    import mne
+
+    for raw in raws:
+        ica = mne.preprocessing.ICA(n_components=artifact_removal.N_COMPONENTS,
+                                    random_state=artifact_removal.RANDOM_STATE,
+                                    max_iter=artifact_removal.ICA_MAX_ITER,
+                                    fit_params={"tol": artifact_removal.ICA_TOL})
+        ica.fit(raw, verbose=False)
+        eog_channels = [ch for ch in artifact_removal.EOG_PROXY_CHANNELS if ch in raw.ch_names]
+        eog_idx = ica.find_bads_eog(raw, ch_name=eog_channels, verbose=False)[0] if eog_channels else []
+        muscle_idx = ica.find_bads_muscle(raw, threshold=artifact_removal.MUSCLE_THRESHOLD, verbose=False)[0]
+        ica.exclude = sorted(set(eog_idx) | set(muscle_idx))
+        ica.apply(raw, verbose=False)
+
+
+def benchmark_subject(subject: str, edf_paths: list, cache_dir: Path) -> dict:
+    raws = [preprocessing.clean_recording(edf_path) for edf_path in edf_paths]
+    run_names = [p.name for p in edf_paths]
+    row = {"subject": subject, "n_runs": len(raws)}
+
+    start = time.perf_counter()
+    per_run_ica([raw.copy() for raw in raws])
+    row["per_run_s"] = time.perf_counter() - start
+
+    for mode in ["cold", "warm"]:
+        start = time.perf_counter()
+        report = artifact_removal.remove_artifacts(subject, [raw.copy() for raw in raws], run_names, cache_dir)
+        row[f"{mode}_s"] = time.perf_counter() - start
+        row[f"{mode}_cached"] = report["cached"]
+    row["excluded"] = len(report["excluded"])
+    return row
+
+
+def main():
+    import mne
+    import pandas as pd
+
+    mne.set_log_level("ERROR")
+    subjects = {}
+    for edf_path in sorted(preprocessing.RAW_DATA_DIR.glob("*.edf")):
+        subjects.setdefault(edf_path.name.split("_")[0], []).append(edf_path)
+    subjects = dict(list(subjects.items())[:N_SUBJECTS])
+    print(f"⏱️ Benchmarking ICA artifact removal on {len(subjects)} subject(s)...\n")
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for subject, edf_paths in subjects.items():
+            print(f"🔹 {subject} ({len(edf_paths)} run(s))")
+            rows.append(benchmark_subject(subject, edf_paths, Path(tmp)))
+
+    df = pd.DataFrame(rows)
+    print(df.to_string(index=False))
+
+    totals = df.sum(numeric_only=True)
+    print("\n=== Totals ===")
+    print(f"  per-run full-rate ICA: {totals['per_run_s']:8.2f} s")
+    print(f"  subject ICA (decim={artifact_removal.ICA_DECIM}), cold cache: {totals['cold_s']:8.2f} s "
+          f"({totals['per_run_s'] / totals['cold_s']:.2f}× faster)")
+    print(f"  subject ICA, warm cache: {totals['warm_s']:8.2f} s "
+          f"({totals['per_run_s'] / totals['warm_s']:.2f}× faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Make src/ importable when run as: python src/benchmarks/bench_signal_store.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import signal_store  # noqa: E402
+
+# 🔧 Parameters
+CLEAN_DIR = Path("data/clean")
+N_FILES = 10
+N_REPEATS = 3                                    # Timings are the best of N_REPEATS runs
+PARTIAL_CHANNELS = ["C3..", "Cz..", "C4.."]      # Motor channels, as for a sensorimotor feature
+PARTIAL_WINDOW = (20., 30.)                      # Seconds
+BROWSE_WINDOW = 10.                              # Seconds per page when scrolling through a recording
+BROWSE_CHANNELS = 10
+
+
+def best_time(func, *args, **kwargs) -> float:
+    times = []
+    for _ in range(N_REPEATS):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+# === .fif access patterns ===
+
+def fif_full(fif_file: Path):
+    import mne
+
+    return mne.io.read_raw_fif(fif_file, preload=True, verbose=False).get_data()
+
+
+def fif_partial(fif_file: Path):
+    import mne
+
+    raw = mne.io.read_raw_fif(fif_file, preload=False, verbose=False)
+    start, stop = raw.time_as_index(PARTIAL_WINDOW)
+    return raw.get_data(picks=PARTIAL_CHANNELS, start=start, stop=stop + 1)
+
+
+def fif_browse(fif_file: Path):
+    import mne
+
+    raw = mne.io.read_raw_fif(fif_file, preload=False, verbose=False)
+    window = int(BROWSE_WINDOW * raw.info["sfreq"])
+    for start in range(0, raw.n_times - window + 1, window):
+        raw.get_data(picks=list(range(BROWSE_CHANNELS)), start=start, stop=start + window)
+
+
+# === Chunked store access patterns ===
+
+def chunked_full(path: Path):
+    with signal_store.ChunkedSignalReader(path) as reader:
+        return reader.read()
+
+
+def chunked_partial(path: Path):
+    with signal_store.ChunkedSignalReader(path) as reader:
+        return reader.read(picks=PARTIAL_CHANNELS, tmin=PARTIAL_WINDOW[0], tmax=PARTIAL_WINDOW[1])
+
+
+def chunked_browse(path: Path):
+    with signal_store.ChunkedSignalReader(path) as reader:
+        for _ in reader.iter_windows(BROWSE_WINDOW, picks=list(range(BROWSE_CHANNELS))):
+            pass
+
+
+def benchmark_file(fif_file: Path, out_dir: Path) -> dict:
+    import mne
+    import numpy as np
+
+    raw = mne.io.read_raw_fif(fif_file, preload=True, verbose=False)
+    row = {"file": fif_file.name}
+
+    start = time.perf_counter()
+    path = signal_store.write_chunked(raw, out_dir / fif_file.name)
+    row["write_s"] = time.perf_counter() - start
+
+    row["size_mb_fif"] = fif_file.stat().st_size / 1e6
+    row["size_mb_chunked"] = path.stat().st_size / 1e6
+
+    for name, fif_func, chunked_func in [("full", fif_full, chunked_full),
+                                         ("partial", fif_partial, chunked_partial),
+                                         ("browse", fif_browse, chunked_browse)]:
+        row[f"{name}_s_fif"] = best_time(fif_func, fif_file)
+        row[f"{name}_s_chunked"] = best_time(chunked_func, path)
+
+    # .fif stores float32, so the chunked copy must match it bit for bit
+    row["lossless"] = bool(np.array_equal(chunked_full(path), fif_full(fif_file).astype(np.float32)))
+    return row
+
+
+def main():
+    import pandas as pd
+
+    fif_files = sorted(CLEAN_DIR.glob("*.fif"))[:N_FILES]
+    print(f"⏱️ Benchmarking the chunked signal store on {len(fif_files)} cleaned recording(s)...\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = [benchmark_file(fif_file, Path(tmp)) for fif_file in fif_files]
+
+    df = pd.DataFrame(rows)
+    totals = df.sum(numeric_only=True)
+
+    print("=== Totals (.fif → chunked) ===")
+    for metric, unit in [("size_mb", "MB"), ("full_s", "s"), ("partial_s", "s"), ("browse_s", "s")]:
+        fif, chunked = totals[f"{metric}_fif"], totals[f"{metric}_chunked"]
+        print(f"{metric:>10}: {fif:8.3f} {unit} → {chunked:8.3f} {unit}  ({fif / chunked:.2f}×)")
+    print(f"{'write_s':>10}: {totals['write_s']:8.3f} s")
+    print(f"Lossless vs .fif in {df['lossless'].sum()}/{len(df)} recordings")
+
+
+if __name__ == "__main__":
+    main()
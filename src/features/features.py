@@ -1,8 +1,9 @@
-import mne
-import numpy as np
-import pandas as pd
+import sys
 from pathlib import Path
 
+# Make src/ importable when run as: python src/features/features.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
 # EEG frequency bands
 FREQ_BANDS = {
     "delta": (1, 4),
@@ -11,22 +12,28 @@ FREQ_BANDS = {
     "beta": (13, 30)
 }
 
+# Welch window in seconds (256 samples at 160 Hz), so band powers do not depend on the sampling rate
+WELCH_SECONDS = 1.6
+
 # Paths
 CLEAN_DIR = Path("data/clean")
 OUTPUT_CSV = Path("outputs/features.csv")
-OUTPUT_CSV.parent.mkdir(parents=True, exist_ok=True)
 
-# Collect all .fif files
-fif_files = sorted(CLEAN_DIR.glob("*.fif"))
 
-features = []
+def extract_features(fif_file: Path) -> dict:
+    """
+    Compute mean band powers for one cleaned recording.
+
+    :param fif_file: Path to a cleaned .fif (or chunked .bwc) file
+    :return: Row with subject, run, label and one column per frequency band
+    """
+    import numpy as np
+    from signal_store import read_clean
 
-for fif_file in fif_files:
-    print(f"🔍 Extracting features from {fif_file.name}")
-    raw = mne.io.read_raw_fif(fif_file, preload=True)
+    raw = read_clean(fif_file)
 
     # Compute power spectral density
-    psd = raw.compute_psd(fmin=1, fmax=30)
+    psd = raw.compute_psd(fmin=1, fmax=30, n_fft=int(round(WELCH_SECONDS * raw.info["sfreq"])))
     freqs = psd.freqs
     psd_values = psd.get_data()  # shape: (n_channels, n_freqs)
 
@@ -56,15 +63,34 @@ for fif_file in fif_files:
     else:
         label = "unknown"
 
-    # Append result
-    features.append({
+    return {
         "subject": subject,
         "run": run,
         "label": label,
         **band_powers
-    })
+    }
+
+
+def main():
+    import pandas as pd
+
+    OUTPUT_CSV.parent.mkdir(parents=True, exist_ok=True)
+
+    from signal_store import list_clean_files
+
+    # Collect all cleaned files (.fif or chunked .bwc)
+    fif_files = list_clean_files(CLEAN_DIR)
+
+    features = []
+    for fif_file in fif_files:
+        print(f"🔍 Extracting features from {fif_file.name}")
+        features.append(extract_features(fif_file))
+
+    # Convert to DataFrame and save
+    df = pd.DataFrame(features)
+    df.to_csv(OUTPUT_CSV, index=False)
+    print(f"\n✅ Features saved to {OUTPUT_CSV}")
+
 
-# Convert to DataFrame and save
-df = pd.DataFrame(features)
-df.to_csv(OUTPUT_CSV, index=False)
-print(f"\n✅ Features saved to {OUTPUT_CSV}")
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
-import mne
-import numpy as np
-import pandas as pd
+import sys
 from pathlib import Path
 
+# Make src/ importable when run as: python src/features/features_advanced.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
 # === Define EEG frequency bands ===
 FREQ_BANDS = {
     "delta": (1, 4),
@@ -11,20 +12,26 @@ FREQ_BANDS = {
     "beta": (13, 30)
 }
 
+# === Welch window in seconds (256 samples at 160 Hz), independent of the sampling rate ===
+WELCH_SECONDS = 1.6
+
 # === Set input and output paths ===
-CLEAN_DIR = Path("data/clean")                        # Folder with preprocessed .fif files
+CLEAN_DIR = Path("data/clean")                        # Folder with preprocessed .fif / .bwc files
 OUTPUT_CSV = Path("outputs/features_advanced.csv")    # Output feature file
-OUTPUT_CSV.parent.mkdir(parents=True, exist_ok=True)
 
-# === Get list of EEG files ===
-fif_files = sorted(CLEAN_DIR.glob("*.fif"))
-features = []
 
-# === Process each EEG file ===
-for fif_file in fif_files:
-    print(f"Processing {fif_file.name}")
-    raw = mne.io.read_raw_fif(fif_file, preload=True, verbose=False)
-    psd = raw.compute_psd(fmin=1, fmax=30)
+def extract_features(fif_file: Path) -> dict:
+    """
+    Compute band powers and derived spectral ratios for one cleaned recording.
+
+    :param fif_file: Path to a cleaned .fif (or chunked .bwc) file
+    :return: Row with subject, run, label and all advanced features
+    """
+    import numpy as np
+    from signal_store import read_clean
+
+    raw = read_clean(fif_file)
+    psd = raw.compute_psd(fmin=1, fmax=30, n_fft=int(round(WELCH_SECONDS * raw.info["sfreq"])))
     freqs = psd.freqs
     psd_values = psd.get_data()  # shape: (n_channels, n_freqs)
     mean_psd = np.mean(psd_values, axis=0)
@@ -64,14 +71,35 @@ for fif_file in fif_files:
         label = "unknown"
 
     # === Store all features for this file ===
-    features.append({
+    return {
         "subject": subject,
         "run": run,
         "label": label,
         **band_powers
-    })
+    }
+
+
+def main():
+    import pandas as pd
+
+    OUTPUT_CSV.parent.mkdir(parents=True, exist_ok=True)
+
+    # === Get list of EEG files ===
+    from signal_store import list_clean_files
+
+    fif_files = list_clean_files(CLEAN_DIR)
+    features = []
+
+    # === Process each EEG file ===
+    for fif_file in fif_files:
+        print(f"Processing {fif_file.name}")
+        features.append(extract_features(fif_file))
+
+    # === Convert to DataFrame and save ===
+    df = pd.DataFrame(features)
+    df.to_csv(OUTPUT_CSV, index=False)
+    print(f"✅ Features saved to: {OUTPUT_CSV}")
+
 
-# === Convert to DataFrame and save ===
-df = pd.DataFrame(features)
-df.to_csv(OUTPUT_CSV, index=False)
-print(f"✅ Features saved to: {OUTPUT_CSV}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Make src/ importable when run as: python src/features/features_complexity.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# === Define paths ===
+CLEAN_DIR = Path("data/clean")
+OUTPUT_CSV = Path("outputs/features_complexity.csv")
+
+# === Feature bank settings ===
+PERM_ORDER = 3        # Length of the ordinal patterns for permutation entropy
+PERM_DELAY = 1        # Lag between samples of a pattern
+HIGUCHI_KMAX = 10     # Largest time scale for Higuchi's fractal dimension
+WELCH_SECONDS = 1.6   # Segment length for the spectral entropy PSD (256 samples at 160 Hz)
+
+# Every function below works on the last axis of an array shaped (n_channels, n_times)
+# or (n_epochs, n_channels, n_times) and returns one value per leading index,
+# so all channels (and epochs) are processed together without a Python loop over channels.
+
+
+def hjorth_parameters(data):
+    """
+    Hjorth mobility and complexity for every channel at once.
+
+    Same formulas as hjorth_mobility / hjorth_complexity in features_entropy.py:
+        mobility   = sqrt(var(x') / var(x))
+        complexity = sqrt(var(x'') / var(x')) / mobility
+
+    :param data: Array (..., n_times)
+    :return: (mobility, complexity), each shaped data.shape[:-1]
+    """
+    deriv1 = np.diff(data, axis=-1)
+    deriv2 = np.diff(deriv1, axis=-1)
+
+    var0 = np.var(data, axis=-1)
+    var1 = np.var(deriv1, axis=-1)
+    var2 = np.var(deriv2, axis=-1)
+
+    mobility = np.sqrt(var1 / var0)
+    complexity = np.sqrt(var2 / var1) / mobility
+    return mobility, complexity
+
+
+def permutation_entropy(data, order: int = PERM_ORDER, delay: int = PERM_DELAY, normalize: bool = True):
+    """
+    Permutation entropy: Shannon entropy of the ordinal patterns of `order` consecutive samples.
+
+    Every pattern is turned into an integer code, and the codes of all channels are
+    counted with a single np.bincount (each channel gets its own range of bins).
+
+    :param data: Array (..., n_times)
+    :param order: Pattern length
+    :param delay: Lag between the samples of a pattern
+    :param normalize: Divide by log2(order!) so the result lies in [0, 1]
+    :return: Array shaped data.shape[:-1]
+    """
+    lead_shape = data.shape[:-1]
+    rows = data.reshape(-1, data.shape[-1])
+    n_rows = rows.shape[0]
+
+    # (n_rows, n_patterns, order) view of all delay-embedded patterns — no copy
+    windows = np.lib.stride_tricks.sliding_window_view(rows, (order - 1) * delay + 1, axis=-1)[..., ::delay]
+    ranks = np.argsort(windows, axis=-1, kind="stable")
+
+    n_codes = order ** order
+    codes = ranks @ (order ** np.arange(order))                    # (n_rows, n_patterns)
+    codes += (np.arange(n_rows) * n_codes)[:, np.newaxis]           # Separate bins per row
+    counts = np.bincount(codes.ravel(), minlength=n_rows * n_codes).reshape(n_rows, n_codes)
+
+    p = counts / counts.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        entropy = -np.sum(np.where(p > 0, p * np.log2(p), 0.), axis=1)
+
+    if normalize:
+        entropy /= np.log2(math.factorial(order))
+    return entropy.reshape(lead_shape)
+
+
+def spectral_entropy(data, sfreq: float, window_s: float = WELCH_SECONDS, normalize: bool = True):
+    """
+    Spectral entropy: Shannon entropy of the normalized Welch PSD.
+
+    :param data: Array (..., n_times)
+    :param sfreq: Sampling frequency (Hz)
+    :param window_s: Welch segment length in seconds
+    :param normalize: Divide by log2(n_freqs) so the result lies in [0, 1]
+    :return: Array shaped data.shape[:-1]
+    """
+    from scipy.signal import welch
+
+    nperseg = min(int(round(window_s * sfreq)), data.shape[-1])
+    _, psd = welch(data, fs=sfreq, nperseg=nperseg, axis=-1)
+    p = psd / psd.sum(axis=-1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        entropy = -np.sum(np.where(p > 0, p * np.log2(p), 0.), axis=-1)
+
+    if normalize:
+        entropy /= np.log2(psd.shape[-1])
+    return entropy
+
+
+def petrosian_fd(data):
+    """
+    Petrosian fractal dimension, based on the number of sign changes of the first derivative.
+
+    :param data: Array (..., n_times)
+    :return: Array shaped data.shape[:-1]
+    """
+    n = data.shape[-1]
+    deriv = np.diff(data, axis=-1)
+    n_delta = np.count_nonzero(deriv[..., 1:] * deriv[..., :-1] < 0, axis=-1)
+    return np.log10(n) / (np.log10(n) + np.log10(n / (n + 0.4 * n_delta)))
+
+
+def higuchi_fd(data, kmax: int = HIGUCHI_KMAX):
+    """
+    Higuchi fractal dimension.
+
+    The loops only run over the time scales k and offsets m (kmax·(kmax+1)/2 steps);
+    each step handles all channels at once.
+
+    :param data: Array (..., n_times)
+    :param kmax: Largest time scale
+    :return: Array shaped data.shape[:-1]
+    """
+    lead_shape = data.shape[:-1]
+    rows = data.reshape(-1, data.shape[-1])
+    n = rows.shape[-1]
+
+    ks = np.arange(1, kmax + 1)
+    log_lengths = np.empty((kmax, rows.shape[0]))
+
+    for i, k in enumerate(ks):
+        lengths = np.zeros(rows.shape[0])
+        for m in range(k):
+            n_steps = (n - m - 1) // k
+            if n_steps == 0:
+                continue
+            curve = np.abs(np.diff(rows[:, m::k][:, :n_steps + 1], axis=-1)).sum(axis=-1)
+            lengths += curve * (n - 1) / (n_steps * k) / k
+        log_lengths[i] = np.log(lengths / k)
+
+    # Slope of log(L(k)) against log(1/k), fitted for all channels in one call
+    slope, _ = np.polyfit(np.log(1. / ks), log_lengths, deg=1)
+    return slope.reshape(lead_shape)
+
+
+def complexity_bank(data, sfreq: float) -> dict:
+    """
+    Compute the whole complexity feature bank for every channel (and epoch).
+
+    :param data: Array (n_channels, n_times) or (n_epochs, n_channels, n_times)
+    :param sfreq: Sampling frequency (Hz)
+    :return: {feature name: array shaped data.shape[:-1]}
+    """
+    mobility, complexity = hjorth_parameters(data)
+    return {
+        "hjorth_mobility": mobility,
+        "hjorth_complexity": complexity,
+        "perm_entropy": permutation_entropy(data),
+        "spectral_entropy": spectral_entropy(data, sfreq),
+        "higuchi_fd": higuchi_fd(data),
+        "petrosian_fd": petrosian_fd(data),
+    }
+
+
+def bank_to_row(bank: dict, ch_names: list) -> dict:
+    """
+    Flatten a (n_channels,) feature bank into one CSV row: "<feature>_<channel>" columns.
+
+    :param bank: Output of complexity_bank for a single recording or epoch
+    :param ch_names: Channel names, in the same order as the data
+    """
+    names = [ch.strip(".") for ch in ch_names]  # EEGBCI names are padded with dots, e.g. "Fc5."
+    return {
+        f"{feature}_{ch}": value
+        for feature, values in bank.items()
+        for ch, value in zip(names, values)
+    }
+
+
+def extract_features(fif_file: Path) -> dict:
+    """
+    Compute the per-channel complexity features for one cleaned recording.
+
+    :param fif_file: Path to a cleaned .fif (or chunked .bwc) file
+    :return: Row with subject, run, label and one column per feature and channel
+    """
+    from preprocessing import FEATURE_SFREQ, to_feature_rate
+    from signal_store import read_clean
+
+    raw = read_clean(fif_file)
+    raw.pick("eeg")
+
+    # All measures of the bank depend on the sampling rate: compute them on a common
+    # 80 Hz, 30 Hz low-passed copy, so --decim does not change the features
+    bank = complexity_bank(to_feature_rate(raw.get_data(), raw.info["sfreq"]), FEATURE_SFREQ)
+
+    # === Metadata ===
+    parts = fif_file.stem.split("_")
+    subject = parts[0]
+    run = parts[1] if len(parts) > 1 else "unknown"
+
+    # === Label assignment ===
+    if "R01" in run or "R02" in run:
+        label = "rest"
+    elif any(r in run for r in ["R03", "R04", "R07", "R08"]):
+        label = "motor"
+    else:
+        label = "unknown"
+
+    return {
+        "subject": subject,
+        "run": run,
+        "label": label,
+        **bank_to_row(bank, raw.ch_names)
+    }
+
+
+def main():
+    import pandas as pd
+
+    OUTPUT_CSV.parent.mkdir(parents=True, exist_ok=True)
+
+    features = []
+    from signal_store import list_clean_files
+
+    fif_files = list_clean_files(CLEAN_DIR)
+
+    for fif_file in fif_files:
+        print(f"Processing {fif_file.name}")
+        features.append(extract_features(fif_file))
+
+    # === Save to CSV ===
+    df = pd.DataFrame(features)
+    df.to_csv(OUTPUT_CSV, index=False)
+    print(f"✅ Features saved to {OUTPUT_CSV}")
+
+
+if __name__ == "__main__":
+    main()
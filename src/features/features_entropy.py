@@ -1,14 +1,17 @@
-import mne
-import numpy as np
-import pandas as pd
+import sys
 from pathlib import Path
-from antropy import sample_entropy
-from scipy.signal import welch
+
+import numpy as np
+
+# Make src/ importable when run as: python src/features/features_entropy.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 # === Define paths ===
 CLEAN_DIR = Path("data/clean")
 OUTPUT_CSV = Path("outputs/features_entropy.csv")
-OUTPUT_CSV.parent.mkdir(parents=True, exist_ok=True)
+
+# Welch segment in seconds (1024 samples at 160 Hz), independent of the sampling rate
+WELCH_SECONDS = 6.4
 
 # === Hjorth parameter functions ===
 def hjorth_mobility(signal):
@@ -75,19 +78,30 @@ def hjorth_complexity(signal):
     deriv2 = np.diff(deriv1)
     return np.sqrt(np.var(deriv2) / np.var(deriv1)) / hjorth_mobility(signal)
 
-# === Extract features from each file ===
-features = []
-fif_files = sorted(CLEAN_DIR.glob("*.fif"))
 
-for fif_file in fif_files:
-    print(f"Processing {fif_file.name}")
-    raw = mne.io.read_raw_fif(fif_file, preload=True, verbose=False)
+def extract_features(fif_file: Path) -> dict:
+    """
+    Compute sample entropy, Hjorth parameters and the alpha²/beta ratio for one cleaned recording.
+
+    :param fif_file: Path to a cleaned .fif (or chunked .bwc) file
+    :return: Row with subject, run, label and the entropy features
+    """
+    from antropy import sample_entropy
+    from preprocessing import to_feature_rate
+    from scipy.signal import welch
+    from signal_store import read_clean
+
+    raw = read_clean(fif_file)
     data, _ = raw[:, :]  # Get EEG signal, shape = (n_channels, n_times)
 
     # === Reduce to 1D signal by averaging over all EEG channels ===
     # This gives a single general-purpose signal representing overall brain activity over time
     signal = np.mean(data, axis=0)
 
+    # Sample entropy and Hjorth parameters depend on the sampling rate, so they are computed
+    # on a common 80 Hz, 30 Hz low-passed copy (same values with or without --decim)
+    feature_signal = to_feature_rate(signal, raw.info["sfreq"])
+
     # === Sample Entropy ===
     #
     # What is sample_entropy?
@@ -108,7 +122,7 @@ for fif_file in fif_files:
     # - Resting brain activity tends to be more repetitive → lower entropy
     # - Active or motor/cognitive tasks often produce more complex signals → higher entropy
     try:
-        sampen = sample_entropy(signal)
+        sampen = sample_entropy(feature_signal)
     except:
         sampen = 0  # fallback if NaN or error
 
@@ -117,16 +131,16 @@ for fif_file in fif_files:
     # Measures the average frequency of the signal.
     # Computed as: sqrt(variance of first derivative / variance of signal)
     # Higher values → faster fluctuations
-    mob = hjorth_mobility(signal)
+    mob = hjorth_mobility(feature_signal)
 
     # === Hjorth Complexity ===
     # Measures how rapidly the frequency content of the signal changes.
     # Computed as: sqrt(var(second derivative) / var(first derivative)) / mobility
     # Higher values → more irregular frequency shifts
-    comp = hjorth_complexity(signal)
+    comp = hjorth_complexity(feature_signal)
 
     # === Frequency bands using Welch PSD ===
-    freqs, psd = welch(signal, fs=raw.info["sfreq"], nperseg=1024)
+    freqs, psd = welch(signal, fs=raw.info["sfreq"], nperseg=int(round(WELCH_SECONDS * raw.info["sfreq"])))
     alpha_idx = np.where((freqs >= 8) & (freqs < 13))[0]
     beta_idx = np.where((freqs >= 13) & (freqs < 30))[0]
 
@@ -148,7 +162,7 @@ for fif_file in fif_files:
         label = "unknown"
 
     # === Save extracted features ===
-    features.append({
+    return {
         "subject": subject,
         "run": run,
         "label": label,
@@ -156,9 +170,29 @@ for fif_file in fif_files:
         "hjorth_mobility": mob,
         "hjorth_complexity": comp,
         "alpha2_over_beta": alpha2_beta
-    })
+    }
+
+
+def main():
+    import pandas as pd
+
+    OUTPUT_CSV.parent.mkdir(parents=True, exist_ok=True)
+
+    # === Extract features from each file ===
+    features = []
+    from signal_store import list_clean_files
+
+    fif_files = list_clean_files(CLEAN_DIR)
+
+    for fif_file in fif_files:
+        print(f"Processing {fif_file.name}")
+        features.append(extract_features(fif_file))
+
+    # === Save to CSV ===
+    df = pd.DataFrame(features)
+    df.to_csv(OUTPUT_CSV, index=False)
+    print(f"✅ Features saved to {OUTPUT_CSV}")
+
 
-# === Save to CSV ===
-df = pd.DataFrame(features)
-df.to_csv(OUTPUT_CSV, index=False)
-print(f"✅ Features saved to {OUTPUT_CSV}")
+if __name__ == "__main__":
+    main()
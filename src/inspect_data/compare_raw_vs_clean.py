@@ -1,34 +1,42 @@
-import mne
 from pathlib import Path
-import matplotlib.pyplot as plt
 
 # === File paths ===
-edf_file = Path("data/raw/S001_S001R01.edf")            # raw .edf
-clean_file = Path("data/clean/S001_S001R01.fif")    # cleaned .fif
+EDF_FILE = Path("data/raw/S001_S001R01.edf")            # raw .edf
+CLEAN_FILE = Path("data/clean/S001_S001R01.fif")    # cleaned .fif
 
-# === Load raw (unfiltered) ===
-raw_raw = mne.io.read_raw_edf(edf_file, preload=True)
-raw_raw.set_eeg_reference('average', projection=True)
 
-# === Load cleaned ===
-raw_clean = mne.io.read_raw_fif(clean_file, preload=True)
+def main(edf_file: Path = EDF_FILE, clean_file: Path = CLEAN_FILE):
+    import mne
+    import matplotlib.pyplot as plt
 
-# === Plot time series comparison ===
-print("🔍 Plotting raw EEG (unfiltered)...")
-raw_raw.plot(n_channels=10, duration=10, title="Raw EEG (unfiltered)")
+    # === Load raw (unfiltered) ===
+    raw_raw = mne.io.read_raw_edf(edf_file, preload=True)
+    raw_raw.set_eeg_reference('average', projection=True)
 
-print("🔍 Plotting cleaned EEG...")
-raw_clean.plot(n_channels=10, duration=10, title="Cleaned EEG")
+    # === Load cleaned ===
+    raw_clean = mne.io.read_raw_fif(clean_file, preload=True)
 
-# === Plot PSD comparison side-by-side ===
-psd_raw = raw_raw.compute_psd(fmax=60)
-psd_clean = raw_clean.compute_psd(fmax=60)
+    # === Plot time series comparison ===
+    print("🔍 Plotting raw EEG (unfiltered)...")
+    raw_raw.plot(n_channels=10, duration=10, title="Raw EEG (unfiltered)")
 
-fig_raw = psd_raw.plot(show=False)
-fig_clean = psd_clean.plot(show=False)
+    print("🔍 Plotting cleaned EEG...")
+    raw_clean.plot(n_channels=10, duration=10, title="Cleaned EEG")
 
-# Save both to files
-fig_raw.savefig("outputs/psd_raw_S001.png")
-fig_clean.savefig("outputs/psd_clean_S001.png")
+    # === Plot PSD comparison side-by-side ===
+    fmax = min(60, raw_raw.info["sfreq"] / 2, raw_clean.info["sfreq"] / 2)  # Decimated files stop lower
+    psd_raw = raw_raw.compute_psd(fmax=fmax)
+    psd_clean = raw_clean.compute_psd(fmax=fmax)
 
-print("✅ Saved PSD plots to outputs/")
+    fig_raw = psd_raw.plot(show=False)
+    fig_clean = psd_clean.plot(show=False)
+
+    # Save both to files
+    fig_raw.savefig("outputs/psd_raw_S001.png")
+    fig_clean.savefig("outputs/psd_clean_S001.png")
+
+    print("✅ Saved PSD plots to outputs/")
+
+
+if __name__ == "__main__":
+    main()
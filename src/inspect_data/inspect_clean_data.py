@@ -1,21 +1,29 @@
-import mne
 from pathlib import Path
 
-# === Load a cleaned EEG file ===
-clean_file = Path("data/clean/S001_S001R01.fif")  # Replace with your file name
+# === Cleaned EEG file to inspect ===
+CLEAN_FILE = Path("data/clean/S001_S001R01.fif")  # Replace with your file name
 
-print(f"Loading {clean_file.name}...")
-raw = mne.io.read_raw_fif(clean_file, preload=True)
 
-# === Plot EEG time series ===
-print("Showing EEG signal (first 10 channels)...")
-raw.plot(n_channels=10, duration=10, scalings='auto')  # Interactive window
+def main(clean_file: Path = CLEAN_FILE):
+    import mne
 
-# === Plot Power Spectral Density ===
-print("Showing Power Spectral Density (0–60 Hz)...")
-psd = raw.compute_psd(fmax=60)
+    print(f"Loading {clean_file.name}...")
+    raw = mne.io.read_raw_fif(clean_file, preload=True)
 
-# Plot and save as PNG
-fig = psd.plot()
-fig.savefig("outputs/psd_S001_S001R01.png")
-print("✅ PSD plot saved to outputs/psd_S001_S001R01.png")
+    # === Plot EEG time series ===
+    print("Showing EEG signal (first 10 channels)...")
+    raw.plot(n_channels=10, duration=10, scalings='auto')  # Interactive window
+
+    # === Plot Power Spectral Density ===
+    fmax = min(60, raw.info["sfreq"] / 2)  # Decimated files stop at a lower Nyquist
+    print(f"Showing Power Spectral Density (0–{fmax:g} Hz)...")
+    psd = raw.compute_psd(fmax=fmax)
+
+    # Plot and save as PNG
+    fig = psd.plot()
+    fig.savefig("outputs/psd_S001_S001R01.png")
+    print("✅ PSD plot saved to outputs/psd_S001_S001R01.png")
+
+
+if __name__ == "__main__":
+    main()
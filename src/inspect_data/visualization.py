@@ -1,18 +1,19 @@
 from pathlib import Path
-import mne
-import matplotlib.pyplot as plt
 
 
 def plot_psd(fif_file: Path, fmax: float = 60.0, save_path: Path = None):
     """
     Compute and plot the Power Spectral Density (PSD) of a cleaned EEG file.
 
-    :param fif_file: Path to a .fif file (cleaned EEG)
-    :param fmax: Max frequency to show in the plot
+    :param fif_file: Path to a .fif or chunked .bwc file (cleaned EEG)
+    :param fmax: Max frequency to show in the plot (capped at Nyquist, e.g. 40 Hz for decimated files)
     :param save_path: Optional path to save the plot as PNG
     """
-    raw = mne.io.read_raw_fif(fif_file, preload=True)
-    psd = raw.compute_psd(fmax=fmax)
+    import matplotlib.pyplot as plt
+    from signal_store import read_clean
+
+    raw = read_clean(fif_file)
+    psd = raw.compute_psd(fmax=min(fmax, raw.info["sfreq"] / 2))
     fig = psd.plot(show=False)
 
     if save_path:
@@ -29,15 +30,19 @@ def compare_psd(edf_file: Path, fif_file: Path, fmax: float = 60.0, save_prefix:
 
     :param edf_file: Path to the original raw .edf EEG file
     :param fif_file: Path to the cleaned .fif EEG file
-    :param fmax: Max frequency to show in the plot
+    :param fmax: Max frequency to show in both plots (capped at the cleaned file's Nyquist)
     :param save_prefix: Optional path prefix to save both plots
     """
+    import mne
+    import matplotlib.pyplot as plt
+
     raw_raw = mne.io.read_raw_edf(edf_file, preload=True)
     raw_raw.set_eeg_reference('average', projection=True)
 
     raw_clean = mne.io.read_raw_fif(fif_file, preload=True)
 
-    # Compute PSDs
+    # Compute PSDs over the same range (a decimated file has a lower Nyquist)
+    fmax = min(fmax, raw_raw.info["sfreq"] / 2, raw_clean.info["sfreq"] / 2)
     psd_raw = raw_raw.compute_psd(fmax=fmax)
     psd_clean = raw_clean.compute_psd(fmax=fmax)
 
@@ -1,40 +1,337 @@
-import mne
+import argparse
+import csv
+import os
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import fcntl  # Serializes catalog updates between worker processes (POSIX only)
+except ImportError:
+    fcntl = None
+
 # 🔧 Parameters
 RAW_DATA_DIR = Path("data/raw")
 CLEAN_DATA_DIR = Path("data/clean")
-CLEAN_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 # Bandpass filter settings (1–40 Hz)
 LOW_FREQ = 1.
 HIGH_FREQ = 40.
 NOTCH_FREQ = 50.  # Hz
 
-# Find all .edf files in data/raw
-edf_files = list(RAW_DATA_DIR.glob("*.edf"))
+# Optional decimation after band-pass (2 → 80 Hz for the 160 Hz dataset, 1 = keep full rate)
+DECIM = 1
+FEATURE_FMAX = 30.  # Highest frequency used by src/features/ — aliases must stay above it
+FEATURE_SFREQ = 80.  # Common rate of the sample-based features (the lowest rate check_decimation allows at 160 Hz)
+CATALOG_NAME = "catalog.csv"
+CATALOG_FIELDS = ["file", "sfreq", "decim", "n_channels", "n_times"]
+
+# Cleaned file format: "fif" (one .fif per recording) or "chunked" (.bwc, see signal_store.py)
+OUTPUT_FORMAT = "fif"
+
+# Optional ICA artifact removal (one cached decomposition per subject, see artifact_removal.py)
+USE_ICA = False
+
+
+@lru_cache(maxsize=None)
+def design_bandpass(sfreq: float, l_freq: float = LOW_FREQ, h_freq: float = HIGH_FREQ):
+    """
+    Design the zero-phase FIR band-pass (or low-pass, with l_freq=None) used by raw.filter()
+    and cache it per sampling rate.
+
+    All recordings of the dataset share the same sfreq, so the design is computed
+    once per process. The returned array is shared between callers — do not modify it.
+
+    :param sfreq: Sampling frequency of the data (Hz)
+    :param l_freq: Low cut-off (Hz)
+    :param h_freq: High cut-off (Hz)
+    :return: FIR coefficients (odd length, symmetric)
+    """
+    import mne
+
+    return mne.filter.create_filter(None, sfreq, l_freq, h_freq, fir_design="firwin", verbose=False)
+
+
+def stopband_edge(sfreq: float, h_freq: float = HIGH_FREQ) -> float:
+    """
+    Frequency above which the band-pass fully attenuates, using MNE's "auto" transition bandwidth.
+    """
+    return h_freq + min(max(0.25 * h_freq, 2.), sfreq / 2. - h_freq)
+
+
+def check_decimation(sfreq: float, decim: int, h_freq: float = HIGH_FREQ) -> float:
+    """
+    Make sure the band-pass is a sufficient anti-alias filter for the decimation factor.
+
+    After decimation, a frequency f above the new Nyquist folds back to new_sfreq - f.
+    Everything the band-pass lets through lies below its stopband edge, so aliases
+    land at or above new_sfreq - stopband_edge, which must not reach FEATURE_FMAX.
+
+    :param sfreq: Original sampling frequency (Hz)
+    :param decim: Integer decimation factor
+    :param h_freq: High cut-off of the band-pass (Hz)
+    :return: The new sampling frequency
+    """
+    if decim < 1:
+        raise ValueError(f"Decimation factor must be a positive integer, got {decim}")
+
+    new_sfreq = sfreq / decim
+    if new_sfreq - stopband_edge(sfreq, h_freq) < FEATURE_FMAX:
+        raise ValueError(
+            f"Decimating {sfreq:g} Hz by {decim} would alias band-pass content "
+            f"(up to {stopband_edge(sfreq, h_freq):g} Hz) into the {FEATURE_FMAX:g} Hz feature band"
+        )
+    return new_sfreq
+
+
+def fir_filter(data, h):
+    """
+    Zero-phase FIR filtering along the last axis, as in raw.filter(): the signal is
+    odd-reflect-padded by half the filter length and convolved, so the output keeps its length.
+
+    :param data: Array (..., n_times)
+    :param h: Symmetric FIR coefficients of odd length (from design_bandpass)
+    """
+    import numpy as np
+    from scipy.signal import oaconvolve
+
+    half = len(h) // 2
+    pad = [(0, 0)] * (data.ndim - 1) + [(half, half)]
+    padded = np.pad(data, pad, mode="reflect", reflect_type="odd")
+    return oaconvolve(padded, h.reshape((1,) * (data.ndim - 1) + (-1,)), mode="valid", axes=-1)
+
+
+def to_feature_rate(data, sfreq: float):
+    """
+    Low-pass a cleaned signal to FEATURE_FMAX and decimate it to FEATURE_SFREQ.
+
+    Sample-based features (Hjorth parameters, entropies, fractal dimensions) depend on
+    the sampling rate and on everything up to Nyquist, including the band-pass transition
+    band that decimation folds back below 40 Hz. Computing them on this common signal makes
+    recordings cleaned with and without --decim give the same values. The 30 Hz low-pass
+    stops before 40 Hz, so the final decimation does not alias.
+
+    :param data: Array (..., n_times) sampled at sfreq
+    :param sfreq: Sampling frequency (Hz), an integer multiple of FEATURE_SFREQ
+    :return: Array (..., n_times * FEATURE_SFREQ / sfreq)
+    """
+    import numpy as np
+
+    factor = sfreq / FEATURE_SFREQ
+    if factor < 1 or factor != int(factor):
+        raise ValueError(f"Features need a sampling rate that is a multiple of {FEATURE_SFREQ:g} Hz, got {sfreq:g} Hz")
+    # Contiguous copy: antropy's compiled functions reject strided arrays
+    return np.ascontiguousarray(fir_filter(data, design_bandpass(sfreq, None, FEATURE_FMAX))[..., ::int(factor)])
+
+
+def apply_bandpass(raw, l_freq: float = LOW_FREQ, h_freq: float = HIGH_FREQ):
+    """
+    Band-pass filter a preloaded Raw in place with the cached FIR design.
+
+    Equivalent to raw.filter(l_freq, h_freq): the signal is odd-reflect-padded by half the
+    filter length and convolved, which keeps the output zero-phase and the same length.
+
+    :param raw: Preloaded mne.io.Raw
+    """
+    h = design_bandpass(raw.info["sfreq"], l_freq, h_freq)
+    raw.apply_function(lambda data: fir_filter(data, h), channel_wise=False, verbose=False)
+
+    with raw.info._unlock():
+        raw.info["highpass"] = l_freq
+        raw.info["lowpass"] = h_freq
+    return raw
+
+
+def apply_bandpass_decimate(raw, decim: int, l_freq: float = LOW_FREQ, h_freq: float = HIGH_FREQ):
+    """
+    Band-pass filter and keep every decim-th sample (integer-factor decimation).
+
+    The band-pass FIR doubles as the anti-alias filter, so no second filter is run:
+    the kept samples are exactly apply_bandpass(raw) followed by [:, ::decim].
+    (A direct polyphase upfirdn would skip the dropped outputs, but with a ~500-tap
+    filter the FFT convolution is still several times faster.)
+
+    :param raw: Preloaded mne.io.Raw
+    :param decim: Integer decimation factor
+    :return: New mne.io.Raw at sfreq / decim (annotations and projectors are kept)
+    """
+    import mne
 
-print(f"🧠 Found {len(edf_files)} EDF file(s) to preprocess...\n")
+    sfreq = raw.info["sfreq"]
+    new_sfreq = check_decimation(sfreq, decim, h_freq)
+    decimated = fir_filter(raw.get_data(), design_bandpass(sfreq, l_freq, h_freq))[:, ::decim]
 
-for edf_path in edf_files:
-    print(f"🔹 Processing {edf_path.name}")
+    info = raw.info.copy()
+    with info._unlock():
+        info["sfreq"] = new_sfreq
+        info["highpass"] = l_freq
+        info["lowpass"] = min(h_freq, new_sfreq / 2.)
+
+    new_raw = mne.io.RawArray(decimated, info, first_samp=raw.first_samp // decim, verbose=False)
+    new_raw.set_annotations(raw.annotations)
+    return new_raw
+
+
+def clean_recording(edf_path: Path, decim: int = DECIM):
+    """
+    Load one raw .edf recording and apply reference, notch and band-pass filtering.
+
+    :param edf_path: Path to the raw .edf file
+    :param decim: Optional decimation factor applied together with the band-pass
+    :return: Cleaned mne.io.Raw
+    """
+    import mne
 
     # Load raw EEG data
-    raw = mne.io.read_raw_edf(edf_path, preload=True)
+    raw = mne.io.read_raw_edf(edf_path, preload=True, verbose=False)
 
     # Set EEG reference to average
-    raw.set_eeg_reference('average', projection=True)
+    raw.set_eeg_reference('average', projection=True, verbose=False)
 
     # Apply notch filter at 50 Hz (remove power line noise)
-    raw.notch_filter(freqs=NOTCH_FREQ)
+    raw.notch_filter(freqs=NOTCH_FREQ, verbose=False)
+
+    # Apply bandpass filter to keep only 1–40 Hz activity (and optionally drop to a lower rate)
+    check_decimation(raw.info["sfreq"], decim, HIGH_FREQ)
+    if decim > 1:
+        return apply_bandpass_decimate(raw, decim, LOW_FREQ, HIGH_FREQ)
+    apply_bandpass(raw, LOW_FREQ, HIGH_FREQ)
+    return raw
+
+
+def preprocess_file(edf_path: Path, out_dir: Path = CLEAN_DATA_DIR, decim: int = DECIM,
+                    output_format: str = OUTPUT_FORMAT) -> dict:
+    """
+    Clean one recording and save it in .fif (or chunked .bwc) format.
+
+    :param edf_path: Path to the raw .edf file
+    :param out_dir: Folder for the cleaned file
+    :param decim: Optional decimation factor (1 = keep the original sampling rate)
+    :param output_format: "fif" or "chunked"
+    :return: Catalog entry of the saved file (path, sampling rate, shape)
+    """
+    raw = clean_recording(edf_path, decim)
+    return save_clean(raw, edf_path, out_dir, decim, output_format)
+
+
+def save_clean(raw, edf_path: Path, out_dir: Path = CLEAN_DATA_DIR, decim: int = DECIM,
+               output_format: str = OUTPUT_FORMAT) -> dict:
+    """
+    Save a cleaned recording under the name of its source .edf file.
+
+    The file is also recorded in the catalog of out_dir.
+
+    :return: Catalog entry of the saved file (path, sampling rate, shape)
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    if output_format == "chunked":
+        from signal_store import write_chunked
+
+        # Save as compressed, randomly accessible time × channel chunks
+        output_path = write_chunked(raw, out_dir / Path(edf_path).name)
+    else:
+        # Save the cleaned data in .fif format
+        output_path = out_dir / Path(edf_path).with_suffix(".fif").name
+        raw.save(output_path, overwrite=True, verbose=False)
+
+    entry = {
+        "file": str(output_path),
+        "sfreq": raw.info["sfreq"],
+        "decim": decim,
+        "n_channels": len(raw.ch_names),
+        "n_times": raw.n_times,
+    }
+    write_catalog([entry], out_dir)
+    return entry
+
+
+def write_catalog(entries: list, out_dir: Path = CLEAN_DATA_DIR) -> Path:
+    """
+    Add or update one row per cleaned file (including its sampling rate) in the catalog next to the data.
+
+    Rows of other files are kept, so every caller of save_clean (main, the worker,
+    preprocess_subject) keeps the catalog complete. The update holds a lock file and
+    replaces the CSV atomically.
+
+    :param entries: Catalog entries returned by preprocess_file / save_clean
+    :param out_dir: Folder with the cleaned files
+    :return: Path of the catalog CSV
+    """
+    catalog_path = out_dir / CATALOG_NAME
+    with open(catalog_path.with_suffix(".lock"), "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+        rows = {}
+        if catalog_path.exists():
+            with open(catalog_path, newline="") as f:
+                rows = {row["file"]: row for row in csv.DictReader(f)}
+        rows.update({entry["file"]: entry for entry in entries})
+
+        tmp_path = catalog_path.with_suffix(".tmp")
+        with open(tmp_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CATALOG_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows[file] for file in sorted(rows))
+        os.replace(tmp_path, catalog_path)
+    return catalog_path
+
+
+def preprocess_subject(subject: str, edf_paths: list, out_dir: Path = CLEAN_DATA_DIR, decim: int = DECIM,
+                       output_format: str = OUTPUT_FORMAT) -> list:
+    """
+    Clean all runs of one subject, remove artifacts with one shared ICA, and save them.
+
+    :return: Catalog entries of the saved files
+    """
+    from artifact_removal import remove_artifacts
+
+    raws = [clean_recording(edf_path, decim) for edf_path in edf_paths]
+    settings = {"low": LOW_FREQ, "high": HIGH_FREQ, "notch": NOTCH_FREQ, "decim": decim}
+    report = remove_artifacts(subject, raws, [p.name for p in edf_paths], extra=settings)
+
+    source = "cached" if report["cached"] else "fitted"
+    print(f"   🧹 ICA {source} in {report['fit_s']:.2f}s, applied to {len(raws)} run(s) in "
+          f"{report['apply_s']:.2f}s, excluded components: {report['excluded']}")
+
+    return [save_clean(raw, edf_path, out_dir, decim, output_format) for raw, edf_path in zip(raws, edf_paths)]
+
+
+def main(out_dir: Path = CLEAN_DATA_DIR, decim: int = DECIM, output_format: str = OUTPUT_FORMAT,
+         use_ica: bool = USE_ICA):
+    # Find all .edf files in data/raw
+    edf_files = sorted(RAW_DATA_DIR.glob("*.edf"))
+
+    print(f"🧠 Found {len(edf_files)} EDF file(s) to preprocess...\n")
+
+    if use_ica:
+        # Group runs by subject (file names look like S001_S001R01.edf)
+        subjects = {}
+        for edf_path in edf_files:
+            subjects.setdefault(edf_path.name.split("_")[0], []).append(edf_path)
+
+        for subject, edf_paths in subjects.items():
+            print(f"🔹 Processing {subject} ({len(edf_paths)} run(s))")
+            preprocess_subject(subject, edf_paths, out_dir, decim, output_format)
+            print(f"   ✅ Saved cleaned files to {out_dir}/\n")
+    else:
+        for edf_path in edf_files:
+            print(f"🔹 Processing {edf_path.name}")
+            entry = preprocess_file(edf_path, out_dir, decim, output_format)
+            print(f"   ✅ Saved cleaned file to {Path(entry['file']).name} ({entry['sfreq']:g} Hz)\n")
 
-    # Apply bandpass filter to keep only 1–40 Hz activity
-    raw.filter(l_freq=LOW_FREQ, h_freq=HIGH_FREQ)
+    print(f"✅ All files processed and saved in {out_dir}/ (catalog: {CATALOG_NAME})")
 
-    # Save the cleaned data in .fif format
-    output_path = CLEAN_DATA_DIR / edf_path.with_suffix(".fif").name
-    raw.save(output_path, overwrite=True)
 
-    print(f"   ✅ Saved cleaned file to {output_path.name}\n")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean raw EEG recordings")
+    parser.add_argument("--out-dir", type=Path, default=CLEAN_DATA_DIR)
+    parser.add_argument("--decim", type=int, default=DECIM,
+                        help="Keep every N-th sample after band-pass (2 → 80 Hz)")
+    parser.add_argument("--format", choices=["fif", "chunked"], default=OUTPUT_FORMAT,
+                        help="Write .fif files or chunked, compressed .bwc files")
+    parser.add_argument("--ica", action="store_true", default=USE_ICA,
+                        help="Remove eye-blink and muscle artifacts with one cached ICA per subject")
+    args = parser.parse_args()
 
-print("✅ All files processed and saved in data/clean/")
+    main(args.out_dir, args.decim, args.format, args.ica)
@@ -0,0 +1,445 @@
+import json
+import os
+import struct
+import threading
+import warnings
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# 🔧 Parameters
+SUFFIX = ".bwc"            # BrainWave chunked signal file
+MAGIC = b"BWCHUNK1"
+CHUNK_SECONDS = 4.         # Time length of one chunk
+CHUNK_CHANNELS = 8         # Channels per chunk
+DTYPE = "float32"          # Same precision as raw.save() writes to .fif
+COMPRESSION_LEVEL = 1      # zlib level: 1 is fast and already gets most of the gain after shuffling
+MIN_SAVING = 0.1           # Byte planes that zlib shrinks by less than this are stored raw
+N_THREADS = 4
+
+# File layout:
+#   MAGIC | chunk 0 | chunk 1 | ... | header (JSON) | header length (uint64) | MAGIC
+# Each chunk is a (channels, times) block, byte-shuffled and compressed on its own.
+# The header stores the info, the chunk grid and the (offset, size) of every chunk,
+# so a reader can fetch and decompress only the chunks it needs.
+#
+# Chunk layout: one (flag: uint8, length: uint32) pair per byte plane, then the planes.
+PLANE_RAW, PLANE_ZLIB = 0, 1
+PLANE_HEADER = struct.Struct("<BI")
+
+
+def encode_block(block: np.ndarray, level: int = COMPRESSION_LEVEL) -> bytes:
+    """
+    Byte-shuffle a block and compress each byte plane separately.
+
+    Shuffling groups the i-th byte of every value together. In EEG the sign/exponent
+    plane is highly repetitive and compresses well, while the low mantissa planes are
+    close to random — those are stored raw, so reading them costs no decompression.
+    """
+    planes = np.frombuffer(block.tobytes(), dtype=np.uint8).reshape(-1, block.dtype.itemsize).T
+
+    headers, payloads = [], []
+    for plane in planes:
+        raw = plane.tobytes()
+        packed = zlib.compress(raw, level)
+        if len(packed) <= (1 - MIN_SAVING) * len(raw):
+            headers.append(PLANE_HEADER.pack(PLANE_ZLIB, len(packed)))
+            payloads.append(packed)
+        else:
+            headers.append(PLANE_HEADER.pack(PLANE_RAW, len(raw)))
+            payloads.append(raw)
+    return b"".join(headers + payloads)
+
+
+def decode_block(buffer: bytes, dtype: np.dtype, shape: tuple) -> np.ndarray:
+    """
+    Inverse of encode_block.
+    """
+    dtype = np.dtype(dtype)
+    n_values = int(np.prod(shape))
+    planes = np.empty((dtype.itemsize, n_values), dtype=np.uint8)
+
+    position = PLANE_HEADER.size * dtype.itemsize
+    for i in range(dtype.itemsize):
+        flag, length = PLANE_HEADER.unpack_from(buffer, i * PLANE_HEADER.size)
+        payload = buffer[position:position + length]
+        planes[i] = np.frombuffer(zlib.decompress(payload) if flag == PLANE_ZLIB else payload, dtype=np.uint8)
+        position += length
+    return planes.T.copy().view(dtype).reshape(shape)
+
+
+# === MNE Info <-> JSON ===
+
+def info_to_dict(info) -> dict:
+    """
+    Serialize the parts of an mne.Info needed to rebuild it: channels (names, types,
+    locations), sampling/filter settings, bads, measurement date and SSP projectors.
+    """
+    import mne
+
+    meas_date = info["meas_date"]
+    return {
+        "ch_names": info["ch_names"],
+        "ch_types": info.get_channel_types(),
+        "ch_locs": [ch["loc"].tolist() for ch in info["chs"]],
+        "sfreq": info["sfreq"],
+        "highpass": info["highpass"],
+        "lowpass": info["lowpass"],
+        "line_freq": info["line_freq"],
+        "bads": list(info["bads"]),
+        "custom_ref_applied": int(info["custom_ref_applied"]),
+        "meas_date": meas_date.isoformat() if meas_date is not None else None,
+        "projs": [
+            {
+                "desc": proj["desc"],
+                "kind": int(proj["kind"]),
+                "active": bool(proj["active"]),
+                "explained_var": proj["explained_var"],
+                "col_names": list(proj["data"]["col_names"]),
+                "row_names": proj["data"]["row_names"],
+                "data": np.asarray(proj["data"]["data"]).tolist(),
+            }
+            for proj in info["projs"]
+        ],
+        "mne_version": mne.__version__,
+    }
+
+
+def dict_to_info(meta: dict):
+    """
+    Rebuild an mne.Info from info_to_dict() output.
+    """
+    import datetime
+    import mne
+
+    info = mne.create_info(meta["ch_names"], meta["sfreq"], meta["ch_types"])
+    with info._unlock():
+        info["highpass"] = meta["highpass"]
+        info["lowpass"] = meta["lowpass"]
+        info["line_freq"] = meta["line_freq"]
+        info["custom_ref_applied"] = meta["custom_ref_applied"]
+        for ch, loc in zip(info["chs"], meta["ch_locs"]):
+            ch["loc"][:] = loc
+    info["bads"] = meta["bads"]
+
+    if meta["meas_date"] is not None:
+        info.set_meas_date(datetime.datetime.fromisoformat(meta["meas_date"]))
+
+    with info._unlock():
+        info["projs"] = [
+            mne.Projection(
+                data={
+                    "nrow": len(proj["data"]),
+                    "ncol": len(proj["col_names"]),
+                    "row_names": proj["row_names"],
+                    "col_names": proj["col_names"],
+                    "data": np.array(proj["data"]),
+                },
+                desc=proj["desc"], kind=proj["kind"], active=proj["active"],
+                explained_var=proj["explained_var"],
+            )
+            for proj in meta["projs"]
+        ]
+    return info
+
+
+# === Writer ===
+
+def write_chunked(raw, path: Path, chunk_seconds: float = CHUNK_SECONDS, chunk_channels: int = CHUNK_CHANNELS,
+                  dtype: str = DTYPE, level: int = COMPRESSION_LEVEL, n_threads: int = N_THREADS) -> Path:
+    """
+    Save a Raw as a chunked, compressed signal file.
+
+    :param raw: mne.io.Raw (preloaded or not)
+    :param path: Output file (the .bwc suffix is added if missing)
+    :param chunk_seconds: Time length of one chunk
+    :param chunk_channels: Number of channels per chunk
+    :param dtype: Storage dtype ("float32" matches .fif, "float64" is bit-exact to memory)
+    :param level: zlib compression level
+    :param n_threads: Threads used to compress chunks
+    :return: Path of the written file
+    """
+    path = Path(path).with_suffix(SUFFIX)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    data = raw.get_data().astype(dtype, copy=False)
+    n_channels, n_times = data.shape
+    chunk_times = max(1, int(round(chunk_seconds * raw.info["sfreq"])))
+
+    grid = [
+        (t0, c0)
+        for t0 in range(0, n_times, chunk_times)
+        for c0 in range(0, n_channels, chunk_channels)
+    ]
+
+    def _compress(corner):
+        t0, c0 = corner
+        return encode_block(data[c0:c0 + chunk_channels, t0:t0 + chunk_times], level)
+
+    with ThreadPoolExecutor(n_threads) as pool:
+        blobs = list(pool.map(_compress, grid))
+
+    offsets = []
+    position = len(MAGIC)
+    for blob in blobs:
+        offsets.append([position, len(blob)])
+        position += len(blob)
+
+    header = {
+        "version": 1,
+        "dtype": np.dtype(dtype).str,
+        "n_channels": n_channels,
+        "n_times": n_times,
+        "first_samp": raw.first_samp,
+        "chunk_times": chunk_times,
+        "chunk_channels": chunk_channels,
+        "chunks": offsets,   # Row-major over (time chunk, channel chunk)
+        "info": info_to_dict(raw.info),
+        "annotations": {
+            "onset": raw.annotations.onset.tolist(),
+            "duration": raw.annotations.duration.tolist(),
+            "description": raw.annotations.description.tolist(),
+            "orig_time": raw.annotations.orig_time.isoformat() if raw.annotations.orig_time else None,
+        },
+    }
+    header_bytes = json.dumps(header).encode()
+
+    tmp_path = path.with_suffix(SUFFIX + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        for blob in blobs:
+            f.write(blob)
+        f.write(header_bytes)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(MAGIC)
+    os.replace(tmp_path, path)
+    return path
+
+
+# === Reader ===
+
+def _as_index(indices: tuple):
+    """
+    Use a slice for consecutive indices (a cheap view) and a list otherwise (fancy indexing).
+    """
+    if all(b - a == 1 for a, b in zip(indices, indices[1:])):
+        return slice(indices[0], indices[-1] + 1)
+    return list(indices)
+
+
+class ChunkedSignalReader:
+    """
+    Random-access reader for .bwc files: only the chunks overlapping the requested
+    channels and time range are read and decompressed, in parallel threads.
+
+    Usage:
+        with ChunkedSignalReader("data/clean/S001_S001R01.bwc") as reader:
+            data = reader.read(picks=["C3..", "Cz..", "C4.."], tmin=10, tmax=20)
+            raw = reader.to_raw()   # Full mne.io.RawArray
+    """
+
+    def __init__(self, path: Path, n_threads: int = N_THREADS):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._lock = threading.Lock()  # Reads are serialized, decompression runs in parallel
+        self._pool = ThreadPoolExecutor(n_threads)
+
+        size = os.fstat(self._file.fileno()).st_size
+        trailer = self._pread(size - 8 - len(MAGIC), 8 + len(MAGIC))
+        if trailer[8:] != MAGIC or self._pread(0, len(MAGIC)) != MAGIC:
+            raise ValueError(f"{self.path} is not a chunked signal file")
+        (header_len,) = struct.unpack("<Q", trailer[:8])
+        header_start = size - 8 - len(MAGIC) - header_len
+        self.header = json.loads(self._pread(header_start, header_len))
+
+        self.dtype = np.dtype(self.header["dtype"])
+        self.n_channels = self.header["n_channels"]
+        self.n_times = self.header["n_times"]
+        self.sfreq = self.header["info"]["sfreq"]
+        self.ch_names = self.header["info"]["ch_names"]
+        self._n_channel_chunks = -(-self.n_channels // self.header["chunk_channels"])
+        self._info = None
+
+    def _pread(self, offset: int, nbytes: int) -> bytes:
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(nbytes)
+
+    @property
+    def info(self):
+        """
+        The recording's mne.Info (built on first access).
+        """
+        if self._info is None:
+            self._info = dict_to_info(self.header["info"])
+        return self._info
+
+    def _pick_indices(self, picks) -> np.ndarray:
+        if picks is None:
+            return np.arange(self.n_channels)
+        picks = [picks] if isinstance(picks, (str, int, np.integer)) else picks
+        return np.array([self.ch_names.index(p) if isinstance(p, str) else int(p) for p in picks])
+
+    def _sample_range(self, tmin, tmax) -> tuple:
+        start = 0 if tmin is None else max(0, int(round(tmin * self.sfreq)))
+        stop = self.n_times if tmax is None else min(self.n_times, int(round(tmax * self.sfreq)) + 1)
+        if start >= stop:
+            raise ValueError(f"Empty time range: tmin={tmin}, tmax={tmax}")
+        return start, stop
+
+    def _read_chunk(self, time_chunk: int, channel_chunk: int) -> np.ndarray:
+        chunk_times, chunk_channels = self.header["chunk_times"], self.header["chunk_channels"]
+        offset, nbytes = self.header["chunks"][time_chunk * self._n_channel_chunks + channel_chunk]
+        shape = (
+            min(chunk_channels, self.n_channels - channel_chunk * chunk_channels),
+            min(chunk_times, self.n_times - time_chunk * chunk_times),
+        )
+        return decode_block(self._pread(offset, nbytes), self.dtype, shape)
+
+    def read(self, picks=None, tmin: float = None, tmax: float = None) -> np.ndarray:
+        """
+        Read a channels × time window.
+
+        :param picks: Channel names or indices (None = all channels)
+        :param tmin: Start time in seconds from the start of the recording (None = start)
+        :param tmax: End time in seconds, inclusive like Raw.crop (None = end)
+        :return: Array (n_picks, n_samples) in the storage dtype
+        """
+        chunk_times, chunk_channels = self.header["chunk_times"], self.header["chunk_channels"]
+        picks = self._pick_indices(picks)
+        start, stop = self._sample_range(tmin, tmax)
+        out = np.empty((len(picks), stop - start), dtype=self.dtype)
+
+        # Output rows and rows inside the chunk served by each channel chunk
+        pairs_by_chunk = {}
+        for row, ch in enumerate(picks):
+            pairs_by_chunk.setdefault(ch // chunk_channels, []).append((row, ch % chunk_channels))
+        rows_by_chunk = {chunk: tuple(_as_index(r) for r in zip(*pairs)) for chunk, pairs in pairs_by_chunk.items()}
+
+        def _fill(job):
+            time_chunk, channel_chunk = job
+            block = self._read_chunk(time_chunk, channel_chunk)
+            t0 = time_chunk * chunk_times
+            lo, hi = max(start, t0), min(stop, t0 + block.shape[1])
+            rows, local = rows_by_chunk[channel_chunk]
+            out[rows, lo - start:hi - start] = block[local, lo - t0:hi - t0]
+
+        jobs = [
+            (time_chunk, channel_chunk)
+            for time_chunk in range(start // chunk_times, (stop - 1) // chunk_times + 1)
+            for channel_chunk in rows_by_chunk
+        ]
+        list(self._pool.map(_fill, jobs))
+        return out
+
+    def to_raw(self, picks=None, tmin: float = None, tmax: float = None):
+        """
+        Read a window as an mne.io.RawArray with the stored info and annotations.
+        """
+        import datetime
+        import mne
+
+        picks = self._pick_indices(picks)
+        start, _ = self._sample_range(tmin, tmax)
+        data = self.read(picks, tmin, tmax).astype(np.float64)
+
+        info = mne.pick_info(self.info, picks.tolist())
+        raw = mne.io.RawArray(data, info, first_samp=self.header["first_samp"] + start, verbose=False)
+
+        ann = self.header["annotations"]
+        onset = np.asarray(ann["onset"], dtype=np.float64)
+        if ann["orig_time"]:
+            orig_time = datetime.datetime.fromisoformat(ann["orig_time"])
+        else:
+            # Without orig_time, onsets count from the first sample of the data: re-anchor to the window
+            orig_time = None
+            onset = onset - start / self.sfreq
+        with warnings.catch_warnings():
+            # Annotations outside the window are dropped, as raw.crop() does for .fif files
+            warnings.filterwarnings("ignore", message="Omitted .* outside data range")
+            raw.set_annotations(mne.Annotations(onset, ann["duration"], ann["description"], orig_time))
+        return raw
+
+    def iter_windows(self, window_seconds: float, picks=None):
+        """
+        Yield consecutive (tmin, data) windows, e.g. for window-level features or browsing.
+        """
+        window = int(round(window_seconds * self.sfreq))
+        for start in range(0, self.n_times - window + 1, window):
+            tmin = start / self.sfreq
+            yield tmin, self.read(picks, tmin, (start + window - 1) / self.sfreq)
+
+    def close(self):
+        self._pool.shutdown()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_raw_chunked(path: Path, picks=None, tmin: float = None, tmax: float = None):
+    """
+    Shortcut for ChunkedSignalReader(path).to_raw(...), the .bwc counterpart of mne.io.read_raw_fif.
+    """
+    with ChunkedSignalReader(path) as reader:
+        return reader.to_raw(picks, tmin, tmax)
+
+
+# === Loading cleaned recordings in either format ===
+
+CLEAN_SUFFIXES = (".fif", SUFFIX)
+
+
+def list_clean_files(folder: Path) -> list:
+    """
+    All cleaned recordings in a folder, .fif and chunked .bwc alike, one per recording, sorted by name.
+
+    A recording cleaned in both formats (e.g. after re-running preprocessing.py with another
+    --format) is listed once, as its most recently written file, with a warning.
+    """
+    folder = Path(folder)
+    if not folder.is_dir():
+        return []
+
+    by_stem = {}
+    for path in folder.iterdir():
+        if path.suffix in CLEAN_SUFFIXES:
+            by_stem.setdefault(path.stem, []).append(path)
+
+    duplicates = [stem for stem, paths in by_stem.items() if len(paths) > 1]
+    if duplicates:
+        print(f"⚠️ {len(duplicates)} recording(s) in {folder} exist as both .fif and {SUFFIX}, "
+              f"using the newest file of each (e.g. {sorted(duplicates)[0]})")
+
+    newest = [max(paths, key=lambda path: path.stat().st_mtime) for paths in by_stem.values()]
+    return sorted(newest, key=lambda path: path.name)
+
+
+def read_clean(path: Path, picks=None, tmin: float = None, tmax: float = None):
+    """
+    Load a cleaned recording as a preloaded mne.io.Raw, choosing the reader by file suffix.
+
+    For .bwc files only the chunks overlapping picks / [tmin, tmax] are read.
+
+    :param path: Path to a .fif or .bwc file
+    :param picks: Optional channel names or indices
+    :param tmin: Optional start time (s)
+    :param tmax: Optional end time (s), inclusive
+    """
+    path = Path(path)
+    if path.suffix == SUFFIX:
+        return read_raw_chunked(path, picks, tmin, tmax)
+
+    import mne
+
+    raw = mne.io.read_raw_fif(path, preload=False, verbose=False)
+    if tmin is not None or tmax is not None:
+        raw.crop(tmin=tmin or 0., tmax=tmax)
+    if picks is not None:
+        raw.pick(picks)
+    return raw.load_data(verbose=False)
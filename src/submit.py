@@ -0,0 +1,67 @@
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+# Only the standard library is imported here, so the client starts instantly.
+SOCKET_PATH = Path(os.environ.get("BRAINWAVE_SOCKET", "/tmp/brainwave-worker.sock"))
+
+# Parameters holding file paths; they are made absolute so the daemon's working directory does not matter
+PATH_PARAMS = {"edf", "fif", "save", "out_dir", "checkpoint"}
+
+
+def submit(job: str, params: dict = None, socket_path: Path = SOCKET_PATH) -> dict:
+    """
+    Send one job to the worker daemon and wait for its answer.
+
+    :param job: Job name, e.g. "features", "predict", "preprocess", "plot_psd", "ping", "shutdown"
+    :param params: Keyword arguments of the job
+    :param socket_path: Unix socket of the daemon
+    :return: The daemon's response ({"ok": ..., "result": ...} or {"ok": False, "error": ...})
+    """
+    request = {"job": job, "params": params or {}}
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall((json.dumps(request) + "\n").encode())
+        with sock.makefile("rb") as stream:
+            return json.loads(stream.readline())
+
+
+def parse_params(pairs: list) -> dict:
+    """
+    Turn ["fif=data/clean/x.fif", "fmax=40"] into {"fif": "/abs/data/clean/x.fif", "fmax": 40}.
+    """
+    params = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        if key in PATH_PARAMS:
+            params[key] = str(Path(value).resolve())
+            continue
+        try:
+            params[key] = json.loads(value)
+        except json.JSONDecodeError:
+            params[key] = value
+    return params
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Submit a job to the BrainWave worker daemon (start it with: python src/worker.py)")
+    parser.add_argument("job", help="ping | preprocess | features | predict | plot_psd | shutdown")
+    parser.add_argument("params", nargs="*", help="Job parameters as key=value, e.g. fif=data/clean/S001_S001R01.fif")
+    parser.add_argument("--socket", type=Path, default=SOCKET_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        response = submit(args.job, parse_params(args.params), args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        sys.exit(f"❌ No worker daemon listening on {args.socket}")
+
+    print(json.dumps(response, indent=2))
+    print(f"⏱️ {1000 * (time.perf_counter() - start):.0f} ms", file=sys.stderr)
+    sys.exit(0 if response.get("ok") else 1)
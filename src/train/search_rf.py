@@ -0,0 +1,274 @@
+import argparse
+import itertools
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+
+# === Paths ===
+FEATURES_PATH = Path("outputs/features_advanced.csv")
+TRACE_PATH = Path("outputs/search_rf_trace.csv")
+
+# === Search settings ===
+META_COLUMNS = ["subject", "run", "label"]
+PARAM_GRID = {
+    "max_depth": [None, 8, 16],
+    "max_features": ["sqrt", "log2", 0.5],
+    "min_samples_leaf": [1, 3, 5],
+}
+N_SPLITS = 5                # Subject-grouped CV folds
+ETA = 3                     # Keep the best 1/ETA candidates per rung; budgets grow ETA× per rung
+MAX_TREES = 300             # Trees of the full budget (the refit of the winner)
+MIN_TREES = 10              # Trees per forest at the first rung
+MIN_ROWS = 30               # Training rows per fold at the first rung
+N_JOBS = 4                  # (candidate, fold) forests grown in parallel
+RANDOM_STATE = 42
+
+
+def candidate_configs(grid: dict = PARAM_GRID) -> list:
+    """
+    All combinations of the parameter grid, as a list of dicts.
+    """
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+def interleave_by_class(y: np.ndarray, seed: int = RANDOM_STATE) -> np.ndarray:
+    """
+    Row order in which every prefix keeps the class proportions of y.
+
+    Rows of each class are shuffled and spread evenly over [0, 1); sorting by that
+    position interleaves the classes, so the row budgets of all rungs are nested,
+    stratified subsets of the same training fold.
+
+    :param y: Labels of the training rows
+    :return: Permutation of range(len(y))
+    """
+    rng = np.random.default_rng(seed)
+    position = np.empty(len(y))
+    for label in np.unique(y):
+        idx = rng.permutation(np.flatnonzero(y == label))
+        position[idx] = (np.arange(len(idx)) + rng.random()) / len(idx)
+    return np.argsort(position, kind="stable")
+
+
+def prepare_folds(X: np.ndarray, y: np.ndarray, groups: np.ndarray, n_splits: int = N_SPLITS) -> list:
+    """
+    Standardize every subject-grouped fold once; all candidates share these matrices.
+
+    :return: List of dicts with X_train (rows in interleaved class order), y_train, X_val, y_val
+    """
+    from sklearn.model_selection import GroupKFold
+    from sklearn.preprocessing import StandardScaler
+
+    folds = []
+    for train_idx, val_idx in GroupKFold(n_splits=n_splits).split(X, y, groups):
+        scaler = StandardScaler().fit(X[train_idx])
+        order = train_idx[interleave_by_class(y[train_idx])]
+        folds.append({
+            "X_train": np.ascontiguousarray(scaler.transform(X[order]), dtype=np.float32),
+            "y_train": y[order],
+            "X_val": np.ascontiguousarray(scaler.transform(X[val_idx]), dtype=np.float32),
+            "y_val": y[val_idx],
+        })
+    return folds
+
+
+def rung_budgets(n_candidates: int, n_rows: int, eta: int = ETA, max_trees: int = MAX_TREES,
+                 min_trees: int = MIN_TREES, min_rows: int = MIN_ROWS) -> list:
+    """
+    (rows, trees) budget of every rung: both grow ETA× per rung.
+
+    Halving stops as soon as one candidate is left, so there is one rung per halving
+    (27 → 9 → 3 → 1 is three rungs). The full budget, one ETA step above the last
+    rung, is spent once on the refit of the winner.
+
+    :param n_candidates: Number of configurations in the first rung
+    :param n_rows: Training rows of the smallest fold
+    :return: List of (rows, trees) tuples, one per rung (empty for a single candidate)
+    """
+    n_rungs, survivors = 0, n_candidates
+    while survivors > 1:
+        survivors = math.ceil(survivors / eta)
+        n_rungs += 1
+
+    budgets = []
+    for rung in range(n_rungs):
+        fraction = eta ** (rung - n_rungs)
+        budgets.append((min(n_rows, max(min_rows, int(n_rows * fraction))),
+                        max(min_trees, int(max_trees * fraction))))
+    return budgets
+
+
+def grow_forest(forest, fold: dict, rows: int, trees: int) -> tuple:
+    """
+    Add trees to a warm-started forest on the first `rows` training rows and score it on the fold.
+
+    Trees grown in earlier rungs are kept, so each rung only pays for its new trees
+    (they were trained on a smaller, nested row budget).
+
+    :return: (macro F1 on the validation rows, tree-rows trained in this call)
+    """
+    from sklearn.metrics import f1_score
+
+    n_new = trees - len(getattr(forest, "estimators_", []))
+    if n_new > 0:
+        forest.set_params(n_estimators=trees)
+        forest.fit(fold["X_train"][:rows], fold["y_train"][:rows])
+    score = f1_score(fold["y_val"], forest.predict(fold["X_val"]), average="macro")
+    return score, max(n_new, 0) * rows
+
+
+def successive_halving(folds: list, configs: list, eta: int = ETA, n_jobs: int = N_JOBS) -> tuple:
+    """
+    Evaluate all configurations on a small budget, keep the best 1/eta, grow their forests, repeat.
+
+    :param folds: Output of prepare_folds
+    :param configs: Candidate RandomForestClassifier parameters
+    :return: (index of the best configuration, trace rows with cost and score per candidate and rung)
+    """
+    from joblib import Parallel, delayed
+    from sklearn.ensemble import RandomForestClassifier
+
+    n_rows = min(len(fold["y_train"]) for fold in folds)
+    budgets = rung_budgets(len(configs), n_rows, eta)
+
+    # One warm-started forest per (candidate, fold), kept across rungs
+    forests = {
+        (c, f): RandomForestClassifier(n_estimators=0, warm_start=True, random_state=RANDOM_STATE,
+                                       n_jobs=1, **config)
+        for c, config in enumerate(configs) for f in range(len(folds))
+    }
+
+    alive = list(range(len(configs)))
+    trace = []
+    total_cost = 0
+    start = time.perf_counter()
+
+    # Tree fitting releases the GIL, so threads share the fold matrices without copies
+    with Parallel(n_jobs=n_jobs, prefer="threads") as parallel:
+        for rung, (rows, trees) in enumerate(budgets):
+            tasks = [(c, f) for c in alive for f in range(len(folds))]
+            results = parallel(delayed(grow_forest)(forests[task], folds[task[1]], rows, trees) for task in tasks)
+
+            scores = {c: [] for c in alive}
+            for (c, _), (score, cost) in zip(tasks, results):
+                scores[c].append(score)
+                total_cost += cost
+
+            elapsed = time.perf_counter() - start
+            for c in alive:
+                trace.append({"rung": rung, "candidate": c, **configs[c], "rows": rows, "trees": trees,
+                              "f1_mean": np.mean(scores[c]), "f1_std": np.std(scores[c]),
+                              "cost_tree_rows": total_cost, "elapsed_s": elapsed})
+
+            print(f"   Rung {rung}: {len(alive):3d} candidate(s), {rows} rows × {trees} trees, "
+                  f"best F1 {max(np.mean(s) for s in scores.values()):.3f} ({elapsed:.1f}s)")
+
+            # Keep the best 1/eta candidates (ties broken by lower variance across folds)
+            ranked = sorted(alive, key=lambda c: (-np.mean(scores[c]), np.std(scores[c])))
+            alive = ranked[:max(1, math.ceil(len(alive) / eta))]
+            for c in ranked[len(alive):]:
+                for f in range(len(folds)):
+                    del forests[c, f]
+
+    return alive[0], trace
+
+
+def refit_score(folds: list, config: dict, n_estimators: int, n_jobs: int = N_JOBS) -> list:
+    """
+    Cross-validated macro F1 of a configuration refitted from scratch on every full training fold.
+
+    The forests of the search are warm-started across rungs, so their early trees saw only
+    part of the rows; this is the score a plain fit of the returned parameters gets.
+
+    :return: One F1 score per fold
+    """
+    from joblib import Parallel, delayed
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import f1_score
+
+    def fit_fold(fold):
+        forest = RandomForestClassifier(n_estimators=n_estimators, random_state=RANDOM_STATE, n_jobs=1, **config)
+        forest.fit(fold["X_train"], fold["y_train"])
+        return f1_score(fold["y_val"], forest.predict(fold["X_val"]), average="macro")
+
+    return Parallel(n_jobs=n_jobs, prefer="threads")(delayed(fit_fold)(fold) for fold in folds)
+
+
+def search_rf(features_path: Path = FEATURES_PATH, trace_path: Path = TRACE_PATH, eta: int = ETA,
+              n_jobs: int = N_JOBS) -> dict:
+    """
+    Successive-halving search of RandomForestClassifier parameters under subject-grouped CV.
+
+    :param features_path: Feature CSV with subject, run and label columns
+    :param trace_path: Where to save the cost-versus-score trace
+    :return: Best configuration with its cross-validated F1 after a full-budget refit
+    """
+    import pandas as pd
+
+    df = pd.read_csv(features_path)
+    df = df[df["label"] != "unknown"]
+    X = df.drop(columns=[c for c in META_COLUMNS if c in df.columns]).to_numpy(dtype=np.float64)
+    y = df["label"].to_numpy()
+    groups = df["subject"].to_numpy()
+
+    n_splits = min(N_SPLITS, len(np.unique(groups)))
+    if n_splits < 2:
+        raise ValueError(f"Subject-grouped CV needs at least 2 subjects, found {n_splits} in {features_path}")
+    folds = prepare_folds(X, y, groups, n_splits)
+    configs = candidate_configs()
+    print(f"🔍 Searching {len(configs)} configurations on {len(df)} rows "
+          f"({n_splits} subject-grouped folds, eta={eta})...")
+
+    best, trace = successive_halving(folds, configs, eta, n_jobs)
+
+    # Refit the winner from scratch at full budget (all rows of every fold, MAX_TREES trees):
+    # this is the score the returned parameters get
+    n_estimators = MAX_TREES
+    fold_rows = [len(fold["y_train"]) for fold in folds]
+    start = time.perf_counter()
+    scores = refit_score(folds, configs[best], n_estimators, n_jobs)
+    search_cost = trace[-1]["cost_tree_rows"] if trace else 0
+    search_s = trace[-1]["elapsed_s"] if trace else 0.
+    trace.append({"rung": "refit", "candidate": best, **configs[best],
+                  "rows": int(round(np.mean(fold_rows))),  # Training rows per fold (folds differ slightly)
+                  "trees": n_estimators, "f1_mean": np.mean(scores), "f1_std": np.std(scores),
+                  "cost_tree_rows": search_cost + n_estimators * sum(fold_rows),
+                  "elapsed_s": search_s + time.perf_counter() - start})
+
+    trace_df = pd.DataFrame(trace)
+    trace_path.parent.mkdir(parents=True, exist_ok=True)
+    trace_df.to_csv(trace_path, index=False)
+
+    # Cost of the same grid at full budget, fitted from scratch
+    grid_cost = len(configs) * n_estimators * sum(fold_rows)
+    total_cost = trace[-1]["cost_tree_rows"]
+
+    # Score of the winner in its last rung (None if there was nothing to search)
+    searched = [row for row in trace if row["candidate"] == best and row["rung"] != "refit"]
+    search_f1 = searched[-1]["f1_mean"] if searched else None
+    result = {**configs[best], "n_estimators": int(n_estimators), "f1_mean": np.mean(scores),
+              "f1_std": np.std(scores), "search_f1": search_f1}
+
+    print(f"\n✅ Best configuration: {configs[best]} with {result['n_estimators']} trees")
+    print(f"   Cross-validated F1 (refitted at full budget): {result['f1_mean']:.3f} ± {result['f1_std']:.3f}")
+    if searched:
+        print(f"   Search score (warm-started forest, {searched[-1]['rows']} rows × {searched[-1]['trees']} trees): "
+              f"{search_f1:.3f}")
+    print(f"   Cost: {total_cost:,} tree-rows (search {search_cost:,} + refit {total_cost - search_cost:,}) "
+          f"vs {grid_cost:,} for the full grid ({grid_cost / total_cost:.1f}× less)")
+    print(f"📄 Cost-versus-score trace saved to {trace_path}")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Successive-halving search of random forest parameters")
+    parser.add_argument("--features", type=Path, default=FEATURES_PATH, help="Feature CSV to search on")
+    parser.add_argument("--trace", type=Path, default=TRACE_PATH, help="Output CSV with the search trace")
+    parser.add_argument("--eta", type=int, default=ETA, help="Halving rate (keep 1/eta candidates per rung)")
+    parser.add_argument("--n-jobs", type=int, default=N_JOBS)
+    args = parser.parse_args()
+
+    search_rf(args.features, args.trace, args.eta, args.n_jobs)
@@ -1,63 +1,71 @@
-import pandas as pd
 from pathlib import Path
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import (
-    accuracy_score,
-    f1_score,
-    classification_report,
-    confusion_matrix
-)
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# === Load features ===
-features_path = Path("outputs/features_advanced.csv")
-df = pd.read_csv(features_path)
-
-# === Drop unknown labels ===
-df = df[df["label"] != "unknown"]
-
-# === Select features (exclude subject/run/label) ===
-X = df.drop(columns=["subject", "run", "label"])
-y = df["label"]
-
-# === Train/test split (stratified) ===
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.3, stratify=y, random_state=42
-)
-
-# === Train Random Forest ===
-model = RandomForestClassifier(n_estimators=100, random_state=42)
-model.fit(X_train, y_train)
-
-# === Evaluate ===
-y_pred = model.predict(X_test)
-
-print(f"✅ Accuracy: {accuracy_score(y_test, y_pred):.2f}")
-print(f"✅ F1-score: {f1_score(y_test, y_pred, average='weighted'):.2f}")
-print("\nClassification Report:")
-print(classification_report(y_test, y_pred))
-
-# === Confusion Matrix ===
-cm = confusion_matrix(y_test, y_pred, labels=model.classes_)
-plt.figure(figsize=(5, 4))
-sns.heatmap(cm, annot=True, fmt="d", cmap="Blues",
-            xticklabels=model.classes_, yticklabels=model.classes_)
-plt.xlabel("Predicted")
-plt.ylabel("True Label")
-plt.title("Confusion Matrix")
-plt.tight_layout()
-plt.show()
-
-# === Feature Importance ===
-importances = model.feature_importances_
-feature_names = X.columns
-importance_df = pd.DataFrame({"Feature": feature_names, "Importance": importances})
-importance_df = importance_df.sort_values("Importance", ascending=False)
-
-plt.figure(figsize=(8, 5))
-sns.barplot(data=importance_df, x="Importance", y="Feature", palette="viridis")
-plt.title("Feature Importance (Random Forest)")
-plt.tight_layout()
-plt.show()
+
+FEATURES_PATH = Path("outputs/features_advanced.csv")
+
+
+def main(features_path: Path = FEATURES_PATH):
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import (
+        accuracy_score,
+        f1_score,
+        classification_report,
+        confusion_matrix
+    )
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # === Load features ===
+    df = pd.read_csv(features_path)
+
+    # === Drop unknown labels ===
+    df = df[df["label"] != "unknown"]
+
+    # === Select features (exclude subject/run/label) ===
+    X = df.drop(columns=["subject", "run", "label"])
+    y = df["label"]
+
+    # === Train/test split (stratified) ===
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.3, stratify=y, random_state=42
+    )
+
+    # === Train Random Forest ===
+    model = RandomForestClassifier(n_estimators=100, random_state=42)
+    model.fit(X_train, y_train)
+
+    # === Evaluate ===
+    y_pred = model.predict(X_test)
+
+    print(f"✅ Accuracy: {accuracy_score(y_test, y_pred):.2f}")
+    print(f"✅ F1-score: {f1_score(y_test, y_pred, average='weighted'):.2f}")
+    print("\nClassification Report:")
+    print(classification_report(y_test, y_pred))
+
+    # === Confusion Matrix ===
+    cm = confusion_matrix(y_test, y_pred, labels=model.classes_)
+    plt.figure(figsize=(5, 4))
+    sns.heatmap(cm, annot=True, fmt="d", cmap="Blues",
+                xticklabels=model.classes_, yticklabels=model.classes_)
+    plt.xlabel("Predicted")
+    plt.ylabel("True Label")
+    plt.title("Confusion Matrix")
+    plt.tight_layout()
+    plt.show()
+
+    # === Feature Importance ===
+    importances = model.feature_importances_
+    feature_names = X.columns
+    importance_df = pd.DataFrame({"Feature": feature_names, "Importance": importances})
+    importance_df = importance_df.sort_values("Importance", ascending=False)
+
+    plt.figure(figsize=(8, 5))
+    sns.barplot(data=importance_df, x="Importance", y="Feature", palette="viridis")
+    plt.title("Feature Importance (Random Forest)")
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
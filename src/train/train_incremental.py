@@ -0,0 +1,372 @@
+import argparse
+import os
+from collections import deque
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+# === Paths ===
+SHARD_DIR = Path("outputs/feature_shards")                   # Folder with feature shards (*.csv)
+CHECKPOINT_PATH = Path("outputs/checkpoints/incremental.joblib")
+
+# === Training settings ===
+META_COLUMNS = ["subject", "run", "label"]
+BATCH_SIZE = 50_000         # Rows held in memory at once
+N_EPOCHS = 5                # Passes over the shards (SGD mode only)
+TREES_PER_BATCH = 10        # New trees grown on every training batch (forest mode only)
+MAX_TREES = 200             # Forest size cap; trees are grown on an evenly spread subset of batches
+MAX_DEPTH = 16              # Bounds the size of each tree independently of the batch size
+MIN_SAMPLES_LEAF = 20
+MAX_OPEN_SHARDS = 16        # Shards read round-robin at once, so every batch mixes rows of several shards
+CHECKPOINT_EVERY = 20       # Save a checkpoint every N batches
+RANDOM_STATE = 42
+
+
+def list_shards(source: Path) -> list:
+    """
+    Return the feature files to stream, in a stable order.
+
+    :param source: A folder with *.csv shards or a single CSV file
+    """
+    if source.is_dir():
+        return sorted(source.glob("*.csv"))
+    return [source]
+
+
+def iter_batches(shards: list, batch_size: int = BATCH_SIZE, seed: int = RANDOM_STATE,
+                 max_open: int = MAX_OPEN_SHARDS):
+    """
+    Yield shuffled (X, y) mini-batches mixing rows of several shards, without loading any shard in full.
+
+    Shards are visited in a random order and up to max_open of them are read round-robin,
+    batch_size // max_open rows at a time, so a batch is never made of a single
+    (e.g. single-run, single-class) shard. The order only depends on seed, which keeps
+    resuming from a batch index deterministic. Rows with an "unknown" label are dropped.
+
+    :param shards: List of CSV paths
+    :param batch_size: Rows per batch (peak memory is about one batch)
+    :param seed: Seed of the shard order and of the row shuffle inside each batch
+    :param max_open: Maximum number of shards read at the same time
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    pending = deque(shards[i] for i in rng.permutation(len(shards)))
+    readers = deque()
+    rows_per_read = max(1, batch_size // max_open)
+
+    def make_batch(pieces):
+        batch = pd.concat(pieces, ignore_index=True)
+        batch = batch.iloc[rng.permutation(len(batch))]
+        X = batch.drop(columns=[c for c in META_COLUMNS if c in batch.columns])
+        return X, batch["label"].to_numpy()
+
+    pieces, n_rows = [], 0
+    while readers or pending:
+        while pending and len(readers) < max_open:
+            readers.append(pd.read_csv(pending.popleft(), chunksize=rows_per_read))
+
+        reader = readers.popleft()
+        try:
+            chunk = next(reader)
+        except StopIteration:
+            reader.close()
+            continue
+        readers.append(reader)
+
+        chunk = chunk[chunk["label"] != "unknown"]
+        if chunk.empty:
+            continue
+        pieces.append(chunk)
+        n_rows += len(chunk)
+        if n_rows >= batch_size:
+            yield make_batch(pieces)
+            pieces, n_rows = [], 0
+
+    if pieces:
+        yield make_batch(pieces)
+
+
+def new_state(mode: str, batch_size: int = BATCH_SIZE, n_epochs: int = N_EPOCHS) -> dict:
+    """
+    Create an empty training state (the object that gets checkpointed).
+
+    :param mode: "sgd" for an SGD linear model, "forest" for a forest grown batch by batch
+    :param batch_size: Rows per mini-batch (batch indices in the state are only valid for this size)
+    :param n_epochs: Passes over the data for SGD
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    if mode == "sgd":
+        model = SGDClassifier(loss="log_loss", random_state=42)
+    elif mode == "forest":
+        model = RandomForestClassifier(n_estimators=0, warm_start=True, max_depth=MAX_DEPTH,
+                                       min_samples_leaf=MIN_SAMPLES_LEAF, random_state=RANDOM_STATE)
+    else:
+        raise ValueError(f"Unknown training mode: {mode}")
+
+    return {
+        "mode": mode,
+        "scaler": StandardScaler(),
+        "model": model,
+        "classes": set(),
+        "feature_names": None,
+        "batch_size": batch_size,
+        "n_epochs": n_epochs,
+        "stage": "scaler",   # "scaler" -> "train" -> "done"
+        "epoch": 0,
+        "batch": 0,          # Batches already consumed in the current stage/epoch
+    }
+
+
+def save_checkpoint(state: dict, path: Path = CHECKPOINT_PATH):
+    """
+    Write the training state atomically, so an interrupted save never corrupts the last checkpoint.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    joblib.dump(state, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: Path = CHECKPOINT_PATH) -> dict:
+    return joblib.load(path)
+
+
+def fit_scaler(state: dict, shards: list, batch_size: int, checkpoint_path: Path):
+    """
+    First pass: fit the scaler with running statistics and collect the label set.
+    """
+    for i, (X, y) in enumerate(iter_batches(shards, batch_size)):
+        if i < state["batch"]:
+            continue  # Already seen before the last checkpoint
+
+        if state["feature_names"] is None:
+            state["feature_names"] = list(X.columns)
+        state["scaler"].partial_fit(X[state["feature_names"]].to_numpy())
+        state["classes"].update(y)
+        state["batch"] = i + 1
+
+        if state["batch"] % CHECKPOINT_EVERY == 0:
+            save_checkpoint(state, checkpoint_path)
+
+    state["classes"] = sorted(state["classes"])
+    state["stage"] = "train"
+    state["batch"] = 0
+    save_checkpoint(state, checkpoint_path)
+    print(f"✅ Scaler fitted on {state['scaler'].n_samples_seen_} rows, classes: {state['classes']}")
+
+
+def train_sgd(state: dict, shards: list, batch_size: int, n_epochs: int, checkpoint_path: Path):
+    """
+    Second pass: train the SGD model with partial_fit, one mini-batch at a time.
+    """
+    model = state["model"]
+    classes = np.array(state["classes"])
+
+    while state["epoch"] < n_epochs:
+        # A new shard and row order every epoch
+        for i, (X, y) in enumerate(iter_batches(shards, batch_size, seed=RANDOM_STATE + state["epoch"])):
+            if i < state["batch"]:
+                continue
+
+            X_scaled = state["scaler"].transform(X[state["feature_names"]].to_numpy())
+            model.partial_fit(X_scaled, y, classes=classes)
+            state["batch"] = i + 1
+
+            if state["batch"] % CHECKPOINT_EVERY == 0:
+                save_checkpoint(state, checkpoint_path)
+
+        state["epoch"] += 1
+        state["batch"] = 0
+        save_checkpoint(state, checkpoint_path)
+        print(f"🔹 Epoch {state['epoch']}/{n_epochs} done")
+
+
+def train_forest(state: dict, shards: list, batch_size: int, trees_per_batch: int, checkpoint_path: Path,
+                 max_trees: int = MAX_TREES):
+    """
+    Second pass: grow the forest tree-by-tree, fitting a few new trees on a subset of mini-batches.
+
+    With warm_start=True, each fit only builds the newly added trees, so earlier
+    batches never have to be read again. To keep the model size bounded, trees are
+    only grown on every stride-th batch, with the stride chosen from the row count of
+    the scaler pass so that at most max_trees trees are spread over the whole dataset.
+    Batches that do not contain every class are skipped, because the new trees must
+    agree with the old ones on classes_.
+    """
+    model = state["model"]
+    n_batches = int(np.ceil(np.max(state["scaler"].n_samples_seen_) / batch_size))
+    stride = max(1, int(np.ceil(n_batches * trees_per_batch / max_trees)))
+
+    for i, (X, y) in enumerate(iter_batches(shards, batch_size)):
+        if i < state["batch"]:
+            continue
+
+        sampled = i % stride == 0 and model.n_estimators + trees_per_batch <= max_trees
+        if sampled and len(np.unique(y)) < len(state["classes"]):
+            print(f"   ⚠️ Skipping batch {i}: not all classes present")
+        elif sampled:
+            X_scaled = state["scaler"].transform(X[state["feature_names"]].to_numpy())
+            model.set_params(n_estimators=model.n_estimators + trees_per_batch)
+            model.fit(X_scaled, y)
+        state["batch"] = i + 1
+
+        if state["batch"] % CHECKPOINT_EVERY == 0:
+            save_checkpoint(state, checkpoint_path)
+
+    if not hasattr(model, "estimators_"):
+        raise RuntimeError("No trees were grown: no training batch contained every class")
+
+    state["epoch"] = 1
+    state["batch"] = 0
+    save_checkpoint(state, checkpoint_path)
+    print(f"🌲 Forest grown to {model.n_estimators} trees (one fit every {stride} batch(es))")
+
+
+def resume_state(state: dict, mode: str = None, batch_size: int = None, n_epochs: int = None) -> dict:
+    """
+    Check the requested settings against a loaded checkpoint and fill in the ones not given.
+
+    Batch indices are only meaningful for the batch size they were counted with, and a
+    checkpoint cannot change its model type, so both must match. A larger n_epochs
+    reopens a finished SGD run for more epochs.
+
+    :raises ValueError: If the mode or batch size differ from the checkpoint, or n_epochs is
+        lower than the epochs already trained
+    """
+    if mode is not None and mode != state["mode"]:
+        raise ValueError(f"Checkpoint was trained in '{state['mode']}' mode, not '{mode}'")
+
+    saved_batch_size = state.get("batch_size", batch_size or BATCH_SIZE)  # Older checkpoints did not store it
+    if batch_size is not None and batch_size != saved_batch_size:
+        raise ValueError(f"Checkpoint was trained with batch size {saved_batch_size}, not {batch_size}")
+    state["batch_size"] = saved_batch_size
+
+    n_epochs = n_epochs or state.get("n_epochs", N_EPOCHS)
+    if state["mode"] == "sgd":
+        if n_epochs < state["epoch"]:
+            raise ValueError(f"Checkpoint already trained {state['epoch']} epochs, more than {n_epochs}")
+        if state["stage"] == "done" and n_epochs > state["epoch"]:
+            state["stage"] = "train"
+    state["n_epochs"] = n_epochs
+    return state
+
+
+def evaluate(state: dict, shards: list, batch_size: int = BATCH_SIZE):
+    """
+    Stream a held-out set and report accuracy and weighted F1.
+
+    Only a confusion matrix is accumulated, so memory does not grow with the evaluation set.
+    Rows whose label was never seen in training are counted and left out of the scores.
+    """
+    import pandas as pd
+
+    classes = state["classes"]
+    index = {label: k for k, label in enumerate(classes)}
+    cm = np.zeros((len(classes), len(classes)), dtype=np.int64)
+    unseen = {}
+
+    for X, y in iter_batches(shards, batch_size):
+        known = np.array([label in index for label in y])
+        for label in y[~known]:
+            unseen[label] = unseen.get(label, 0) + 1
+        if not known.any():
+            continue
+
+        X_scaled = state["scaler"].transform(X[state["feature_names"]].to_numpy()[known])
+        y_pred = state["model"].predict(X_scaled)
+        true_idx = np.array([index[label] for label in y[known]])
+        pred_idx = np.array([index[label] for label in y_pred])
+        np.add.at(cm, (true_idx, pred_idx), 1)
+
+    if unseen:
+        print(f"⚠️ Skipped rows with labels not seen in training: {unseen}")
+    if cm.sum() == 0:
+        print("⚠️ No evaluation rows with known labels, nothing to score")
+        return
+
+    support = cm.sum(axis=1)
+    tp = np.diag(cm)
+    precision = np.divide(tp, cm.sum(axis=0), out=np.zeros(len(classes)), where=cm.sum(axis=0) > 0)
+    recall = np.divide(tp, support, out=np.zeros(len(classes)), where=support > 0)
+    f1 = np.divide(2 * precision * recall, precision + recall,
+                   out=np.zeros(len(classes)), where=(precision + recall) > 0)
+
+    print(f"✅ Accuracy: {tp.sum() / cm.sum():.2f}")
+    print(f"✅ F1-score: {np.average(f1, weights=support):.2f}")
+    print("\nConfusion Matrix (rows = true, cols = predicted):")
+    print(pd.DataFrame(cm, index=classes, columns=classes))
+
+
+def train_incremental(source: Path = SHARD_DIR, mode: str = None, batch_size: int = None,
+                      n_epochs: int = None, trees_per_batch: int = TREES_PER_BATCH,
+                      checkpoint_path: Path = CHECKPOINT_PATH, resume: bool = False,
+                      max_trees: int = MAX_TREES) -> dict:
+    """
+    Train a scaler + model out-of-core over feature shards, resuming from a checkpoint if asked.
+
+    :param source: Folder with *.csv feature shards, or a single (large) CSV file
+    :param mode: "sgd" or "forest" (default "sgd", or the checkpoint's mode when resuming)
+    :param batch_size: Rows per mini-batch; bounds peak memory independently of dataset size
+        (default BATCH_SIZE, or the checkpoint's batch size when resuming)
+    :param n_epochs: Passes over the data for SGD (when resuming, a larger value continues a finished run)
+    :param trees_per_batch: Trees added per training mini-batch for the forest
+    :param checkpoint_path: Where the training state is saved
+    :param resume: Continue from checkpoint_path instead of starting over
+    :param max_trees: Maximum forest size (bounds model memory independently of dataset size)
+    :return: The final training state (scaler, model, classes, feature names)
+    """
+    shards = list_shards(source)
+    if not shards:
+        raise FileNotFoundError(f"No feature shards found in {source}")
+
+    if resume and checkpoint_path.exists():
+        state = resume_state(load_checkpoint(checkpoint_path), mode, batch_size, n_epochs)
+        print(f"♻️ Resuming from {checkpoint_path} "
+              f"(stage={state['stage']}, epoch={state['epoch']}, batch={state['batch']})")
+    else:
+        state = new_state(mode or "sgd", batch_size or BATCH_SIZE, n_epochs or N_EPOCHS)
+    batch_size, n_epochs = state["batch_size"], state["n_epochs"]
+
+    print(f"🧠 Training '{state['mode']}' model on {len(shards)} shard(s), {batch_size} rows per batch\n")
+
+    if state["stage"] == "scaler":
+        fit_scaler(state, shards, batch_size, checkpoint_path)
+
+    if state["stage"] == "train":
+        if state["mode"] == "sgd":
+            train_sgd(state, shards, batch_size, n_epochs, checkpoint_path)
+        else:
+            train_forest(state, shards, batch_size, trees_per_batch, checkpoint_path, max_trees)
+        state["stage"] = "done"
+        save_checkpoint(state, checkpoint_path)
+
+    print(f"\n✅ Model saved to {checkpoint_path}")
+    return state
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Out-of-core incremental training over feature shards")
+    parser.add_argument("--source", type=Path, default=SHARD_DIR, help="Shard folder or a single CSV file")
+    parser.add_argument("--mode", choices=["sgd", "forest"], default=None,
+                        help="Model type (default: sgd, or the checkpoint's mode with --resume)")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help=f"Rows per batch (default: {BATCH_SIZE}, or the checkpoint's with --resume)")
+    parser.add_argument("--epochs", type=int, default=None,
+                        help=f"SGD epochs (default: {N_EPOCHS}); with --resume a larger value continues training")
+    parser.add_argument("--trees-per-batch", type=int, default=TREES_PER_BATCH)
+    parser.add_argument("--max-trees", type=int, default=MAX_TREES)
+    parser.add_argument("--checkpoint", type=Path, default=CHECKPOINT_PATH)
+    parser.add_argument("--resume", action="store_true", help="Continue from the last checkpoint")
+    parser.add_argument("--eval", type=Path, default=None, help="Held-out shard folder or CSV to evaluate on")
+    args = parser.parse_args()
+
+    state = train_incremental(args.source, args.mode, args.batch_size, args.epochs,
+                              args.trees_per_batch, args.checkpoint, args.resume, args.max_trees)
+
+    if args.eval is not None:
+        evaluate(state, list_shards(args.eval), state["batch_size"])
@@ -0,0 +1,207 @@
+import argparse
+import importlib
+import json
+import os
+import socketserver
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+# 🔧 Parameters
+SOCKET_PATH = Path(os.environ.get("BRAINWAVE_SOCKET", "/tmp/brainwave-worker.sock"))
+N_WORKERS = 2
+CHECKPOINT_PATH = Path("outputs/checkpoints/incremental.joblib")   # Written by train/train_incremental.py
+DATASET_SFREQ = 160.  # Sampling rate of the EEG Motor Movement/Imagery recordings
+
+# Feature extractors the jobs can use, by short name
+FEATURE_SETS = {
+    "basic": "features.features",
+    "advanced": "features.features_advanced",
+    "entropy": "features.features_entropy",
+    "complexity": "features.features_complexity",
+}
+
+
+def warm_up():
+    """
+    Run once in every worker process: pay for the heavy imports and the filter design
+    before the first job arrives, so jobs only do the actual work.
+    """
+    import matplotlib
+    matplotlib.use("Agg")  # Workers never open windows, plots are saved to files
+
+    import mne
+    import numpy
+    import pandas
+    import scipy.signal
+    import sklearn.ensemble
+    import sklearn.linear_model
+    from antropy import sample_entropy
+
+    mne.set_log_level("WARNING")
+
+    import preprocessing
+    import signal_store
+    preprocessing.design_bandpass(DATASET_SFREQ)
+    preprocessing.design_bandpass(DATASET_SFREQ, None, preprocessing.FEATURE_FMAX)  # to_feature_rate
+    for module_name in FEATURE_SETS.values():
+        importlib.import_module(module_name)
+
+    # antropy is numba-compiled on first call: compile it here, not in the first entropy job
+    sample_entropy(numpy.random.default_rng(0).standard_normal(64))
+
+
+@lru_cache(maxsize=4)
+def load_model(checkpoint: str, mtime: float) -> dict:
+    """
+    Load a training checkpoint once per worker. The file's mtime is part of the cache
+    key, so retraining the model is picked up without restarting the daemon.
+    """
+    import joblib
+
+    return joblib.load(checkpoint)
+
+
+# === Jobs ===
+
+def job_ping() -> dict:
+    return {"pid": os.getpid()}
+
+
+def job_preprocess(edf: str, out_dir: str = None, decim: int = 1, output_format: str = "fif") -> dict:
+    import preprocessing
+
+    out_dir = Path(out_dir) if out_dir else preprocessing.CLEAN_DATA_DIR
+    return preprocessing.preprocess_file(Path(edf), out_dir, decim, output_format)
+
+
+def job_features(fif: str, feature_set: str = "advanced") -> dict:
+    module = importlib.import_module(FEATURE_SETS[feature_set])
+    return module.extract_features(Path(fif))
+
+
+def job_predict(fif: str, feature_set: str = "advanced", checkpoint: str = str(CHECKPOINT_PATH)) -> dict:
+    import numpy as np
+
+    state = load_model(checkpoint, os.path.getmtime(checkpoint))
+    row = job_features(fif, feature_set)
+
+    X = np.array([[row[name] for name in state["feature_names"]]])
+    X_scaled = state["scaler"].transform(X)
+    result = {"subject": row["subject"], "run": row["run"],
+              "prediction": state["model"].predict(X_scaled)[0]}
+    if hasattr(state["model"], "predict_proba"):
+        proba = state["model"].predict_proba(X_scaled)[0]
+        result["probabilities"] = dict(zip(state["model"].classes_, proba))
+    return result
+
+
+def job_plot_psd(fif: str, save: str, fmax: float = 60.0) -> dict:
+    from inspect_data.visualization import plot_psd
+
+    plot_psd(Path(fif), fmax=fmax, save_path=Path(save))
+    return {"output": save}
+
+
+JOBS = {
+    "ping": job_ping,
+    "preprocess": job_preprocess,
+    "features": job_features,
+    "predict": job_predict,
+    "plot_psd": job_plot_psd,
+}
+
+
+def run_job(name: str, params: dict) -> dict:
+    """
+    Execute one job inside a worker process and time it.
+    """
+    if name not in JOBS:
+        raise ValueError(f"Unknown job '{name}', available: {sorted(JOBS)}")
+
+    start = time.perf_counter()
+    result = JOBS[name](**params)
+    return {"ok": True, "result": result, "seconds": time.perf_counter() - start}
+
+
+def to_json(value):
+    """
+    json.dumps fallback for NumPy scalars/arrays and paths.
+    """
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+# === Server ===
+
+class JobHandler(socketserver.StreamRequestHandler):
+    """
+    Reads newline-delimited JSON requests ({"job": ..., "params": {...}}) and
+    answers each one with a single JSON line.
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if request["job"] == "shutdown":
+                    response = {"ok": True, "result": "shutting down"}
+                    self.server.stop()
+                else:
+                    future = self.server.pool.submit(run_job, request["job"], request.get("params", {}))
+                    response = future.result()
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+            self.wfile.write((json.dumps(response, default=to_json) + "\n").encode())
+
+
+class WorkerServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, n_workers: int):
+        self.pool = ProcessPoolExecutor(max_workers=n_workers, initializer=warm_up)
+        super().__init__(str(socket_path), JobHandler)
+
+    def stop(self):
+        # shutdown() blocks until serve_forever() returns, so it must run outside the handler thread
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+
+def serve(socket_path: Path = SOCKET_PATH, n_workers: int = N_WORKERS):
+    """
+    Start the warm worker daemon and block until a "shutdown" job is received.
+
+    :param socket_path: Unix socket the daemon listens on
+    :param n_workers: Number of warm worker processes
+    """
+    if socket_path.exists():
+        socket_path.unlink()  # Stale socket from a previous run
+
+    server = WorkerServer(socket_path, n_workers)
+    print(f"🔥 Warming up {n_workers} worker(s)...")
+    start = time.perf_counter()
+    for future in [server.pool.submit(job_ping) for _ in range(n_workers)]:
+        future.result()
+    print(f"   ✅ Ready in {time.perf_counter() - start:.1f}s, listening on {socket_path}")
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        server.pool.shutdown()
+        if socket_path.exists():
+            socket_path.unlink()
+        print("👋 Worker daemon stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm worker daemon for BrainWave jobs (run from the project root)")
+    parser.add_argument("--socket", type=Path, default=SOCKET_PATH)
+    parser.add_argument("--workers", type=int, default=N_WORKERS)
+    args = parser.parse_args()
+
+    serve(args.socket, args.workers)